@@ -1,11 +1,27 @@
+import os
+
 from setuptools import setup, find_packages
 
+# Optionally compile hot, fully-typed modules to C extensions with mypyc.
+# The pure-Python sources remain the default (and the fallback) build:
+#   KAGENT_USE_MYPYC=1 pip install .
+MYPYC_MODULES = [
+    "src/agents/_task_agent.py",
+]
+
+ext_modules = []
+if os.environ.get("KAGENT_USE_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(MYPYC_MODULES)
+
 setup(
     name="kagent",
     version="0.1.0",
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     include_package_data=True,
+    ext_modules=ext_modules,
     install_requires=[
         "fastapi",
         "uvicorn",
@@ -13,7 +29,7 @@ setup(
         "typer",
         "rich",
         "click",
-        "kubernetes>=12.0.0",
+        "kubernetes>=24.2.0",
         "opentelemetry-api",
         "opentelemetry-sdk",
         "opentelemetry-exporter-otlp",
@@ -32,6 +48,10 @@ setup(
         "scikit-learn>=1.0.0",
         "joblib>=1.0.0",
     ],
+    extras_require={
+        "zstd": ["zstandard"],
+        "orjson": ["orjson"],
+    },
     entry_points={
         "console_scripts": [
             "kagent=kagent.cli:run",
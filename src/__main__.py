@@ -3,7 +3,9 @@
 Main entry point for kagent when run as a module (python -m kagent)
 """
 
-from .cli import run
-
 if __name__ == "__main__":
-    run() 
\ No newline at end of file
+    # Import lazily so that importing kagent.__main__ (e.g. under a spawn-based
+    # multiprocessing start method) does not pull in the whole CLI.
+    from .cli import run
+
+    run()
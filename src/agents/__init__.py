@@ -1,25 +1,58 @@
-from ._task_agent import TaskAgent
-from .metrics_collector import KubernetesMetricsCollector
-from .predictor import KubernetesPredictor
-from .remediator import KubernetesRemediator
-from .security_scanner import KubernetesSecurityScanner
-from .cost_optimizer import KubernetesCostOptimizer
-from .backup_manager import KubernetesBackupManager, BackupJob, RestoreJob
-
-__all__ = [
+"""
+Kagent Agents Package
+
+Contains AI-powered agents for Kubernetes operations and monitoring.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ._task_agent import TaskAgent
+    from .metrics_collector import KubernetesMetricsCollector
+    from .predictor import KubernetesPredictor
+    from .remediator import KubernetesRemediator
+    from .security_scanner import KubernetesSecurityScanner
+    from .cost_optimizer import KubernetesCostOptimizer
+    from .backup_manager import KubernetesBackupManager, BackupJob, RestoreJob
+
+# Public name -> submodule that defines it. Submodules are only imported on
+# first attribute access (PEP 562), so importing the package stays cheap.
+_LAZY = {
+    "TaskAgent": "._task_agent",
+    "KubernetesMetricsCollector": ".metrics_collector",
+    "KubernetesPredictor": ".predictor",
+    "KubernetesRemediator": ".remediator",
+    "KubernetesSecurityScanner": ".security_scanner",
+    "KubernetesCostOptimizer": ".cost_optimizer",
+    "KubernetesBackupManager": ".backup_manager",
+    "BackupJob": ".backup_manager",
+    "RestoreJob": ".backup_manager",
+}
+
+__all__ = (
     "TaskAgent",
     "KubernetesMetricsCollector",
     "KubernetesPredictor",
     "KubernetesRemediator",
     "KubernetesSecurityScanner",
-    "KubernetesCostOptimizer", 
+    "KubernetesCostOptimizer",
     "KubernetesBackupManager",
     "BackupJob",
-    "RestoreJob"
-]
+    "RestoreJob",
+)
 
-"""
-Kagent Agents Package
 
-Contains AI-powered agents for Kubernetes operations and monitoring.
-"""
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    obj = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = obj
+    return obj
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -1,16 +1,33 @@
 """Base Task Agent."""
 
-import abc
 from typing import Any, Dict, List, Optional, Union
 
-class TaskAgent(abc.ABC):
+try:
+    from mypy_extensions import mypyc_attr
+except ImportError:  # mypy_extensions is only needed for the compiled build
+    def mypyc_attr(*attrs: str, **kwattrs: object) -> Any:  # type: ignore[misc]
+        return lambda cls: cls
+
+@mypyc_attr(allow_interpreted_subclasses=True)
+class TaskAgent:
     """Base class for all task agents."""
 
-    @abc.abstractmethod
-    def perform_task(self, task: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+    # The base holds no instance state. Subclasses that also declare their own
+    # __slots__ (listing their attributes) avoid a per-instance __dict__.
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Bind __call__ straight to the subclass's perform_task so calling an
+        # agent does not go through an extra forwarding frame.
+        namespace = vars(cls)
+        if "perform_task" in namespace and "__call__" not in namespace:
+            setattr(cls, "__call__", namespace["perform_task"])
+
+    def perform_task(self, task: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
         """Perform a task and return the result."""
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement perform_task()")
 
-    def __call__(self, task: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+    def __call__(self, task: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
         """Call the agent to perform a task."""
         return self.perform_task(task, **kwargs)
@@ -5,26 +5,136 @@ This module provides backup and recovery capabilities for Kubernetes resources,
 enabling disaster recovery and resource versioning.
 """
 
+import asyncio
+import atexit
+import contextlib
+import io
 import logging
 import json
+import mmap
 import os
 import time
 import yaml
 from datetime import datetime, timedelta
-from pathlib import Path
 import tempfile
-import shutil
 import tarfile
 import threading
-from typing import Dict, List, Any, Optional, Set
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, FrozenSet, List, Any, Optional, Set, Tuple
 
-from kubernetes import client, config
+from kubernetes import client, config, dynamic
 from kubernetes.client.rest import ApiException
 
+# Prefer the libyaml C bindings for (de)serialization when they are available
+try:
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Archive file suffix for each supported compression
+_ARCHIVE_SUFFIXES = {"gz": ".tar.gz", "zstd": ".tar.zst"}
+_ARCHIVE_EXTENSIONS = tuple(_ARCHIVE_SUFFIXES.values())
+
+# Fields added by the system that are stripped from backed-up resources
+_META_DROPS = ("resourceVersion", "uid", "selfLink", "creationTimestamp", "generation", "managedFields")
+_ANN_PREFIX = "kubernetes.io/"
+_SA_TOKEN_SECRET_TYPE = "kubernetes.io/service-account-token"
+
+# Suffix of the uncompressed metadata copy kept next to each archive
+_METADATA_SIDECAR_SUFFIX = ".meta.json"
+# Suffix of the JSON cache of an archive's parsed resources
+_PARSE_CACHE_SUFFIX = ".cache.json"
+
+# apiVersion and kind of each supported resource type; list results omit
+# them from their items, but server-side apply needs them in the body
+_RESOURCE_KINDS = {
+    "pods": ("v1", "Pod"),
+    "services": ("v1", "Service"),
+    "deployments": ("apps/v1", "Deployment"),
+    "statefulsets": ("apps/v1", "StatefulSet"),
+    "daemonsets": ("apps/v1", "DaemonSet"),
+    "replicasets": ("apps/v1", "ReplicaSet"),
+    "configmaps": ("v1", "ConfigMap"),
+    "secrets": ("v1", "Secret"),
+    "ingresses": ("networking.k8s.io/v1", "Ingress"),
+    "jobs": ("batch/v1", "Job"),
+    "cronjobs": ("batch/v1", "CronJob"),
+    "persistentvolumeclaims": ("v1", "PersistentVolumeClaim"),
+    "serviceaccounts": ("v1", "ServiceAccount"),
+    "roles": ("rbac.authorization.k8s.io/v1", "Role"),
+    "rolebindings": ("rbac.authorization.k8s.io/v1", "RoleBinding")
+}
+# Field manager recorded for fields set by server-side apply
+_FIELD_MANAGER = "kagent"
+
+# Concurrent list calls issued while backing up or checking existence
+_LIST_WORKERS = 8
+
+# tarfile's "data" extraction filter (Python 3.12, backported to earlier
+# patch releases) refuses members that would land outside the destination
+_TAR_DATA_FILTER = hasattr(tarfile, "data_filter")
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize data to compact JSON, using orjson when it is available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+def _load_json(payload: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+def _label_items(labels: Optional[Dict[str, str]]) -> FrozenSet[Tuple[str, str]]:
+    """Freeze a label filter into the (key, value) set _passes_label_filter takes."""
+    return frozenset(labels.items()) if labels else frozenset()
+
+def _passes_label_filter(labels: Optional[Dict[str, str]], include_items: FrozenSet[Tuple[str, str]],
+                         exclude_items: FrozenSet[Tuple[str, str]]) -> bool:
+    """Check a restored resource's labels (None if it has none) against a restore's label filters."""
+    if labels is None:
+        return True
+    # Set operations against the items view run without a Python-level loop
+    items = labels.items()
+    if include_items and not include_items <= items:
+        return False
+    if exclude_items and not exclude_items.isdisjoint(items):
+        return False
+    return True
+
+def _checked_member(member: tarfile.TarInfo) -> tarfile.TarInfo:
+    """Refuse archive members the "data" filter would, where tarfile has no filters."""
+    if (os.path.isabs(member.name) or ".." in member.name.split("/")
+            or not (member.isfile() or member.isdir())):
+        raise tarfile.TarError(f"Refusing to extract archive member {member.name!r}")
+    return member
+
+# Namespaces skipped when backing up "all"
+_SYSTEM_NAMESPACES = frozenset({"kube-system", "kube-public", "kube-node-lease"})
+
 class BackupJob:
     """Model representing a backup job"""
+    # Fixed attribute set: no per-instance __dict__, which matters once the
+    # history holds thousands of jobs
+    __slots__ = ("id", "name", "namespaces", "resource_types", "include_labels", "exclude_labels",
+                 "backup_location", "timestamp", "status", "incremental", "parent_backup_id",
+                 "resources_backed_up", "file_size", "error_message")
+    
     def __init__(self, 
                  id: str,
                  name: str,
@@ -34,7 +144,8 @@ class BackupJob:
                  exclude_labels: Optional[Dict[str, str]] = None,
                  backup_location: str = "local",
                  timestamp: Optional[str] = None,
-                 status: str = "pending"):
+                 status: str = "pending",
+                 incremental: bool = False):
         self.id = id
         self.name = name
         self.namespaces = namespaces
@@ -42,8 +153,10 @@ class BackupJob:
         self.include_labels = include_labels or {}
         self.exclude_labels = exclude_labels or {}
         self.backup_location = backup_location  # "local", "s3", etc.
-        self.timestamp = timestamp or datetime.now().isoformat()
+        self.timestamp = timestamp or datetime.now().isoformat(timespec="seconds")
         self.status = status  # "pending", "running", "completed", "failed"
+        self.incremental = incremental  # Only store changes since the last matching backup
+        self.parent_backup_id: Optional[str] = None  # Set when stored as a delta
         self.resources_backed_up: Dict[str, int] = {}
         self.file_size: Optional[int] = None
         self.error_message: Optional[str] = None
@@ -59,6 +172,8 @@ class BackupJob:
             "backup_location": self.backup_location,
             "timestamp": self.timestamp,
             "status": self.status,
+            "incremental": self.incremental,
+            "parent_backup_id": self.parent_backup_id,
             "resources_backed_up": self.resources_backed_up,
             "file_size": self.file_size,
             "error_message": self.error_message
@@ -66,6 +181,10 @@ class BackupJob:
 
 class RestoreJob:
     """Model representing a restore job"""
+    __slots__ = ("id", "backup_id", "name", "namespaces", "resource_types", "include_labels",
+                 "exclude_labels", "restore_strategy", "timestamp", "status", "resources_restored",
+                 "error_message")
+    
     def __init__(self,
                  id: str,
                  backup_id: str,
@@ -85,7 +204,7 @@ class RestoreJob:
         self.include_labels = include_labels or {}
         self.exclude_labels = exclude_labels or {}
         self.restore_strategy = restore_strategy  # "create_or_replace", "create_only", "replace_only"
-        self.timestamp = timestamp or datetime.now().isoformat()
+        self.timestamp = timestamp or datetime.now().isoformat(timespec="seconds")
         self.status = status  # "pending", "running", "completed", "failed"
         self.resources_restored: Dict[str, int] = {}
         self.error_message: Optional[str] = None
@@ -123,7 +242,11 @@ class KubernetesBackupManager:
         backup_dir: str = "~/.kagent/backups",
         max_backups: int = 10,
         history_file: Optional[str] = None,
-        use_mock: bool = False
+        use_mock: bool = False,
+        compression: str = "gz",
+        history_flush_interval: float = 2.0,
+        parallelism: int = 16,
+        mock_delay: float = 0.0
     ):
         """
         Initialize the backup manager.
@@ -134,11 +257,26 @@ class KubernetesBackupManager:
             max_backups: Maximum number of backups to keep
             history_file: Optional path to store backup/restore history
             use_mock: Whether to use mock data instead of connecting to a real Kubernetes cluster
+            compression: Compression for new backup archives ("gz" or "zstd")
+            history_flush_interval: Seconds to coalesce non-final history updates
+                before writing them to the history file
+            parallelism: Maximum number of resources applied concurrently during a restore
+            mock_delay: Seconds a mock backup or restore sleeps to simulate work
         """
+        if compression not in _ARCHIVE_SUFFIXES:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard not available, falling back to gzip compression")
+            compression = "gz"
+        
         self.backup_dir = os.path.expanduser(backup_dir)
         self.max_backups = max_backups
         self.history_file = history_file
         self.use_mock = use_mock
+        self.compression = compression
+        self.history_flush_interval = history_flush_interval
+        self.parallelism = parallelism
+        self.mock_delay = mock_delay
         
         if not self.use_mock:
             # Initialize Kubernetes client only if not in mock mode
@@ -153,13 +291,80 @@ class KubernetesBackupManager:
                         # Fall back to in-cluster config for running inside a pod
                         config.load_incluster_config()
                 
-                self.core_v1 = client.CoreV1Api()
-                self.apps_v1 = client.AppsV1Api()
-                self.batch_v1 = client.BatchV1Api()
-                self.networking_v1 = client.NetworkingV1Api()
-                self.rbac_v1 = client.RbacAuthorizationV1Api()
-                self.storage_v1 = client.StorageV1Api()
-                self.custom_objects = client.CustomObjectsApi()
+                # One ApiClient shared by every API group, so all calls draw on
+                # the same pool of kept-alive connections. The pool is sized from
+                # the restore parallelism, and never below the list workers, so
+                # busy workers never have their connections discarded and
+                # re-established.
+                api_config = client.Configuration.get_default_copy()
+                api_config.connection_pool_maxsize = max(self.parallelism * 2, _LIST_WORKERS)
+                self._api_client = client.ApiClient(api_config)
+                
+                self.core_v1 = client.CoreV1Api(self._api_client)
+                self.apps_v1 = client.AppsV1Api(self._api_client)
+                self.batch_v1 = client.BatchV1Api(self._api_client)
+                self.networking_v1 = client.NetworkingV1Api(self._api_client)
+                self.rbac_v1 = client.RbacAuthorizationV1Api(self._api_client)
+                self.storage_v1 = client.StorageV1Api(self._api_client)
+                self.custom_objects = client.CustomObjectsApi(self._api_client)
+                
+                # Map of resource type to function that lists it in a namespace
+                self._resource_listers = {
+                    "pods": self.core_v1.list_namespaced_pod,
+                    "services": self.core_v1.list_namespaced_service,
+                    "deployments": self.apps_v1.list_namespaced_deployment,
+                    "statefulsets": self.apps_v1.list_namespaced_stateful_set,
+                    "daemonsets": self.apps_v1.list_namespaced_daemon_set,
+                    "replicasets": self.apps_v1.list_namespaced_replica_set,
+                    "configmaps": self.core_v1.list_namespaced_config_map,
+                    "secrets": self.core_v1.list_namespaced_secret,
+                    "ingresses": self.networking_v1.list_namespaced_ingress,
+                    "jobs": self.batch_v1.list_namespaced_job,
+                    "cronjobs": self.batch_v1.list_namespaced_cron_job,
+                    "persistentvolumeclaims": self.core_v1.list_namespaced_persistent_volume_claim,
+                    "serviceaccounts": self.core_v1.list_namespaced_service_account,
+                    "roles": self.rbac_v1.list_namespaced_role,
+                    "rolebindings": self.rbac_v1.list_namespaced_role_binding
+                }
+                
+                # Map of resource type to function that lists it cluster-wide
+                self._cluster_listers = {
+                    "pods": self.core_v1.list_pod_for_all_namespaces,
+                    "services": self.core_v1.list_service_for_all_namespaces,
+                    "deployments": self.apps_v1.list_deployment_for_all_namespaces,
+                    "statefulsets": self.apps_v1.list_stateful_set_for_all_namespaces,
+                    "daemonsets": self.apps_v1.list_daemon_set_for_all_namespaces,
+                    "replicasets": self.apps_v1.list_replica_set_for_all_namespaces,
+                    "configmaps": self.core_v1.list_config_map_for_all_namespaces,
+                    "secrets": self.core_v1.list_secret_for_all_namespaces,
+                    "ingresses": self.networking_v1.list_ingress_for_all_namespaces,
+                    "jobs": self.batch_v1.list_job_for_all_namespaces,
+                    "cronjobs": self.batch_v1.list_cron_job_for_all_namespaces,
+                    "persistentvolumeclaims": self.core_v1.list_persistent_volume_claim_for_all_namespaces,
+                    "serviceaccounts": self.core_v1.list_service_account_for_all_namespaces,
+                    "roles": self.rbac_v1.list_role_for_all_namespaces,
+                    "rolebindings": self.rbac_v1.list_role_binding_for_all_namespaces
+                }
+                
+                # Map of resource type to (create, replace, read) functions
+                self._api_functions = {
+                    "pods": (self.core_v1.create_namespaced_pod, self.core_v1.replace_namespaced_pod, self.core_v1.read_namespaced_pod),
+                    "services": (self.core_v1.create_namespaced_service, self.core_v1.replace_namespaced_service, self.core_v1.read_namespaced_service),
+                    "deployments": (self.apps_v1.create_namespaced_deployment, self.apps_v1.replace_namespaced_deployment, self.apps_v1.read_namespaced_deployment),
+                    "statefulsets": (self.apps_v1.create_namespaced_stateful_set, self.apps_v1.replace_namespaced_stateful_set, self.apps_v1.read_namespaced_stateful_set),
+                    "daemonsets": (self.apps_v1.create_namespaced_daemon_set, self.apps_v1.replace_namespaced_daemon_set, self.apps_v1.read_namespaced_daemon_set),
+                    "replicasets": (self.apps_v1.create_namespaced_replica_set, self.apps_v1.replace_namespaced_replica_set, self.apps_v1.read_namespaced_replica_set),
+                    "configmaps": (self.core_v1.create_namespaced_config_map, self.core_v1.replace_namespaced_config_map, self.core_v1.read_namespaced_config_map),
+                    "secrets": (self.core_v1.create_namespaced_secret, self.core_v1.replace_namespaced_secret, self.core_v1.read_namespaced_secret),
+                    "ingresses": (self.networking_v1.create_namespaced_ingress, self.networking_v1.replace_namespaced_ingress, self.networking_v1.read_namespaced_ingress),
+                    "jobs": (self.batch_v1.create_namespaced_job, self.batch_v1.replace_namespaced_job, self.batch_v1.read_namespaced_job),
+                    "cronjobs": (self.batch_v1.create_namespaced_cron_job, self.batch_v1.replace_namespaced_cron_job, self.batch_v1.read_namespaced_cron_job),
+                    "persistentvolumeclaims": (self.core_v1.create_namespaced_persistent_volume_claim, self.core_v1.replace_namespaced_persistent_volume_claim, self.core_v1.read_namespaced_persistent_volume_claim),
+                    "serviceaccounts": (self.core_v1.create_namespaced_service_account, self.core_v1.replace_namespaced_service_account, self.core_v1.read_namespaced_service_account),
+                    "roles": (self.rbac_v1.create_namespaced_role, self.rbac_v1.replace_namespaced_role, self.rbac_v1.read_namespaced_role),
+                    "rolebindings": (self.rbac_v1.create_namespaced_role_binding, self.rbac_v1.replace_namespaced_role_binding, self.rbac_v1.read_namespaced_role_binding)
+                }
+                
                 logger.info("Successfully initialized Kubernetes client for backup manager")
             except Exception as e:
                 logger.error(f"Failed to initialize Kubernetes client: {e}")
@@ -174,18 +379,52 @@ class KubernetesBackupManager:
             self.rbac_v1 = None
             self.storage_v1 = None
             self.custom_objects = None
+            self._api_client = None
+            self._resource_listers = {}
+            self._cluster_listers = {}
+            self._api_functions = {}
+        
+        # Bounded pools for fanning out list calls and restores to the API
+        # server, created on first use (so mock mode never starts any) and
+        # shut down by close()
+        self._pool_lock = threading.Lock()
+        self._list_pool: Optional[ThreadPoolExecutor] = None
+        self._restore_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Dynamic client for server-side apply, created on first use since
+        # creating it runs API discovery
+        self._dynamic_client: Optional[dynamic.DynamicClient] = None
+        self._dynamic_resources: Dict[str, Any] = {}
+        self._dynamic_lock = threading.Lock()
         
         # Create backup directory if it doesn't exist
         os.makedirs(self.backup_dir, exist_ok=True)
+        # Directories known to exist, so repeated writes skip os.makedirs
+        self._created_dirs: Set[str] = {self.backup_dir}
+        # Archive path of each backup ID, so lookups don't list backup_dir
+        self._backup_files: Dict[str, str] = {}
+        self._scan_backup_files()
         
         # Initialize history storage
         self.backup_jobs: List[BackupJob] = []
         self.restore_jobs: List[RestoreJob] = []
+        # Backup jobs by ID, kept in step with backup_jobs
+        self._backup_jobs_by_id: Dict[str, BackupJob] = {}
         
         # Load history if available
         if history_file:
             self._load_history()
         
+        # Marking a backup or restore as running is left to a background
+        # writer, started by the first such update; outcomes and deletions
+        # are written synchronously by _save_history()
+        self._history_lock = threading.Lock()
+        self._history_dirty = threading.Event()
+        # Set by close() to end the writer
+        self._history_stop = threading.Event()
+        self._writer_lock = threading.Lock()
+        self._history_thread: Optional[threading.Thread] = None
+        
         # In mock mode, create some sample backup/restore data
         if use_mock and not self.backup_jobs:
             self._generate_mock_backup_data()
@@ -196,8 +435,8 @@ class KubernetesBackupManager:
             return
         
         try:
-            with open(self.history_file, 'r') as f:
-                history = json.load(f)
+            with open(self.history_file, 'rb') as f:
+                history = _load_json(f.read())
                 
                 if "backup_jobs" in history:
                     for job_dict in history["backup_jobs"]:
@@ -210,12 +449,14 @@ class KubernetesBackupManager:
                             exclude_labels=job_dict.get("exclude_labels"),
                             backup_location=job_dict["backup_location"],
                             timestamp=job_dict["timestamp"],
-                            status=job_dict["status"]
+                            status=job_dict["status"],
+                            incremental=job_dict.get("incremental", False)
                         )
+                        job.parent_backup_id = job_dict.get("parent_backup_id")
                         job.resources_backed_up = job_dict.get("resources_backed_up", {})
                         job.file_size = job_dict.get("file_size")
                         job.error_message = job_dict.get("error_message")
-                        self.backup_jobs.append(job)
+                        self._add_backup_job(job)
                 
                 if "restore_jobs" in history:
                     for job_dict in history["restore_jobs"]:
@@ -244,21 +485,117 @@ class KubernetesBackupManager:
         if not self.history_file:
             return
         
-        try:
-            history = {
-                "backup_jobs": [job.to_dict() for job in self.backup_jobs],
-                "restore_jobs": [job.to_dict() for job in self.restore_jobs]
-            }
-            
-            # Create parent directories if they don't exist
-            os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
-            
-            with open(self.history_file, 'w') as f:
-                json.dump(history, f, indent=2)
+        with self._history_lock:
+            # Anything pending is covered by this write
+            self._history_dirty.clear()
             
-            logger.debug(f"Saved backup history to {self.history_file}")
-        except Exception as e:
-            logger.error(f"Error saving backup history: {e}")
+            try:
+                history = {
+                    "backup_jobs": [job.to_dict() for job in self.backup_jobs],
+                    "restore_jobs": [job.to_dict() for job in self.restore_jobs]
+                }
+                
+                payload = _dump_json(history)
+                
+                # Create parent directories if they don't exist
+                history_dir = os.path.dirname(self.history_file)
+                if history_dir and history_dir not in self._created_dirs:
+                    os.makedirs(history_dir, exist_ok=True)
+                    self._created_dirs.add(history_dir)
+                
+                # Write to a sibling file and swap it in, so a crash mid-write
+                # never leaves a truncated history behind
+                tmp_file = self.history_file + ".tmp"
+                with open(tmp_file, 'wb') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.history_file)
+                
+                logger.debug(f"Saved backup history to {self.history_file}")
+            except Exception as e:
+                logger.error(f"Error saving backup history: {e}")
+    
+    def _schedule_history_save(self):
+        """Mark the history as changed so the background writer saves it soon."""
+        if self.history_file:
+            self._history_dirty.set()
+            if self._history_thread is None:
+                self._start_history_writer()
+    
+    def _start_history_writer(self):
+        """Start the background history writer, unless it is already running."""
+        with self._writer_lock:
+            if self._history_thread is None:
+                self._history_stop.clear()
+                self._history_thread = threading.Thread(target=self._history_writer,
+                                                        name="backup-history-writer", daemon=True)
+                self._history_thread.start()
+                atexit.register(self.flush_history)
+    
+    def flush_history(self):
+        """
+        Write any pending history update now.
+        
+        Only the running status of in-progress backups and restores is ever
+        pending; this also runs at interpreter exit.
+        """
+        if self._history_dirty.is_set():
+            self._save_history()
+    
+    def _history_writer(self):
+        """Background loop that coalesces history updates into periodic writes."""
+        while True:
+            self._history_dirty.wait()
+            if self._history_stop.wait(self.history_flush_interval):
+                return
+            self.flush_history()
+    
+    def _get_list_pool(self) -> ThreadPoolExecutor:
+        """Pool for concurrent list calls, created on first use."""
+        with self._pool_lock:
+            if self._list_pool is None:
+                self._list_pool = ThreadPoolExecutor(max_workers=_LIST_WORKERS)
+            return self._list_pool
+    
+    def _get_restore_pool(self) -> ThreadPoolExecutor:
+        """Pool for concurrent restores, created on first use."""
+        with self._pool_lock:
+            if self._restore_pool is None:
+                self._restore_pool = ThreadPoolExecutor(max_workers=self.parallelism)
+            return self._restore_pool
+    
+    def close(self):
+        """
+        Write pending history, stop the history writer and release the
+        worker pools and API connections.
+        
+        Call this when done with the manager. A later backup or restore
+        starts new pools and, when needed, a new history writer.
+        """
+        with self._writer_lock:
+            history_thread, self._history_thread = self._history_thread, None
+            if history_thread is not None:
+                pending = self._history_dirty.is_set()
+                self._history_stop.set()
+                # Wake the writer if it is idle; the flush below covers
+                # anything that was pending
+                self._history_dirty.set()
+                history_thread.join()
+                if not pending:
+                    self._history_dirty.clear()
+                atexit.unregister(self.flush_history)
+        self.flush_history()
+        
+        with self._pool_lock:
+            pools = [self._list_pool, self._restore_pool]
+            self._list_pool = self._restore_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        
+        if self._api_client is not None:
+            self._api_client.close()
     
     def create_backup(self, job: BackupJob) -> BackupJob:
         """
@@ -275,185 +612,397 @@ class KubernetesBackupManager:
         
         logger.info(f"Starting backup job: {job.name}")
         job.status = "running"
-        self.backup_jobs.append(job)
-        self._save_history()
+        self._add_backup_job(job)
+        self._schedule_history_save()
+        
+        archive_name = f"{job.id}_{job.name.replace(' ', '_')}_{time.strftime('%Y%m%d_%H%M%S')}{_ARCHIVE_SUFFIXES[self.compression]}"
+        archive_path = os.path.join(self.backup_dir, archive_name)
         
         try:
-            # Create a temporary directory for resources
-            with tempfile.TemporaryDirectory() as temp_dir:
-                total_resources = 0
-                
+            total_resources = 0
+            # Counts are collected locally and published once, since the
+            # history writer may serialize the job in the background
+            resources_backed_up: Dict[str, int] = {}
+            
+            # Let the API server apply the label filters where it can
+            label_selector, exclude_labels = self._build_label_selector(job)
+            
+            # resourceVersion of every backed-up object, keyed by "<ns>/<type>"
+            # and name. An incremental backup only writes the objects whose
+            # version differs from its parent's.
+            resource_versions: Dict[str, Dict[str, str]] = {}
+            parent_versions: Dict[str, Dict[str, str]] = {}
+            # Labels of every written object, keyed by "<ns>/<type>" and name
+            labels_index: Dict[str, Dict[str, Any]] = {}
+            if job.incremental:
+                parent = self._find_parent_backup(job)
+                if parent:
+                    job.parent_backup_id, parent_versions = parent
+                else:
+                    logger.info(f"No previous backup to diff against, taking a full backup for job: {job.name}")
+            
+            # Resources are serialized straight into the archive as they arrive
+            with self._open_archive(archive_path, "w") as tar:
                 # Process each namespace
                 for namespace in job.namespaces:
                     if namespace == "all":
-                        namespaces = [ns.metadata.name for ns in self.core_v1.list_namespace().items]
+                        # One cluster-wide list per resource type, bucketed by namespace
+                        backup_count = self._backup_all_namespaces(
+                            job, tar, label_selector, exclude_labels, resource_versions, parent_versions,
+                            labels_index
+                        )
                     else:
-                        namespaces = [namespace]
-                    
-                    for ns in namespaces:
-                        # Skip system namespaces if backing up "all"
-                        if namespace == "all" and ns in ["kube-system", "kube-public", "kube-node-lease"]:
-                            continue
-                        
-                        # Create directory for namespace
-                        ns_dir = os.path.join(temp_dir, ns)
-                        os.makedirs(ns_dir, exist_ok=True)
-                        
                         # Process each resource type
-                        backup_count = self._backup_resources(job, ns, ns_dir)
-                        total_resources += sum(backup_count.values())
-                        
-                        # Add to job statistics
-                        for resource_type, count in backup_count.items():
-                            if resource_type not in job.resources_backed_up:
-                                job.resources_backed_up[resource_type] = 0
-                            job.resources_backed_up[resource_type] += count
-                
-                # Check if any resources were backed up
-                if total_resources == 0:
-                    logger.warning(f"No resources matched the backup criteria for job: {job.name}")
-                
-                # Create backup archive
-                archive_name = f"{job.id}_{job.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.tar.gz"
-                archive_path = os.path.join(self.backup_dir, archive_name)
-                
-                with tarfile.open(archive_path, "w:gz") as tar:
-                    # Add metadata file
-                    metadata = {
-                        "backup_id": job.id,
-                        "name": job.name,
-                        "timestamp": job.timestamp,
-                        "namespaces": job.namespaces,
-                        "resource_types": job.resource_types,
-                        "include_labels": job.include_labels,
-                        "exclude_labels": job.exclude_labels,
-                        "kubeconfig_context": None,  # TODO: Add context info
-                        "resources": job.resources_backed_up
-                    }
+                        backup_count = self._backup_resources(
+                            job, namespace, tar, label_selector, exclude_labels, resource_versions, parent_versions,
+                            labels_index
+                        )
                     
-                    metadata_path = os.path.join(temp_dir, "metadata.json")
-                    with open(metadata_path, 'w') as f:
-                        json.dump(metadata, f, indent=2)
+                    total_resources += sum(backup_count.values())
                     
-                    # Add all files to archive
-                    tar.add(temp_dir, arcname="")
+                    # Add to job statistics
+                    for resource_type, count in backup_count.items():
+                        if resource_type not in resources_backed_up:
+                            resources_backed_up[resource_type] = 0
+                        resources_backed_up[resource_type] += count
                 
-                # Update job with results
-                job.file_size = os.path.getsize(archive_path)
-                job.status = "completed"
+                job.resources_backed_up = resources_backed_up
                 
-                # Enforce backup retention
-                self._enforce_backup_retention()
+                # Objects the parent had that are gone now
+                deleted: Dict[str, List[str]] = {}
+                for prefix, old_versions in parent_versions.items():
+                    if prefix in resource_versions:
+                        gone = [name for name in old_versions if name not in resource_versions[prefix]]
+                        if gone:
+                            deleted[prefix] = gone
+                    else:
+                        # Listing failed this time; carry the parent's versions
+                        # forward so the next backup can still diff against them
+                        resource_versions[prefix] = old_versions
                 
-                logger.info(f"Backup job completed: {job.name}, backed up {total_resources} resources to {archive_path}")
+                # Check if any resources were backed up
+                if total_resources == 0 and not job.parent_backup_id:
+                    logger.warning(f"No resources matched the backup criteria for job: {job.name}")
+                
+                # Add metadata file
+                metadata = {
+                    "backup_id": job.id,
+                    "name": job.name,
+                    "timestamp": job.timestamp,
+                    "namespaces": job.namespaces,
+                    "resource_types": job.resource_types,
+                    "include_labels": job.include_labels,
+                    "exclude_labels": job.exclude_labels,
+                    "kubeconfig_context": None,  # TODO: Add context info
+                    "resources": job.resources_backed_up,
+                    "parent_backup_id": job.parent_backup_id,
+                    "deleted": deleted,
+                    "resource_versions": resource_versions,
+                    "labels_index": labels_index
+                }
+                self._add_to_archive(tar, "metadata.json", _dump_json(metadata))
+            
+            # Keep a copy next to the archive so metadata can be read without
+            # decompressing the archive
+            with open(archive_path + _METADATA_SIDECAR_SUFFIX, 'wb') as f:
+                f.write(_dump_json(metadata))
+            self._backup_files[job.id] = archive_path
+            
+            # Update job with results
+            job.file_size = os.path.getsize(archive_path)
+            job.status = "completed"
+            
+            # Enforce backup retention
+            self._enforce_backup_retention()
+            
+            logger.info(f"Backup job completed: {job.name}, backed up {total_resources} resources to {archive_path}")
         
         except Exception as e:
             logger.error(f"Error during backup job {job.name}: {e}")
             job.status = "failed"
             job.error_message = str(e)
+            
+            # Don't leave a truncated archive behind
+            for path in (archive_path, archive_path + _METADATA_SIDECAR_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
         
         # Save updated history
         self._save_history()
         
         return job
     
-    def _backup_resources(self, job: BackupJob, namespace: str, output_dir: str) -> Dict[str, int]:
+    def _find_parent_backup(self, job: BackupJob) -> Optional[Tuple[str, Dict[str, Dict[str, str]]]]:
+        """
+        Find the backup an incremental backup should be stored as a delta of.
+        
+        This is the most recent completed backup with the same scope
+        (namespaces, resource types and label filters) whose archive is still
+        on disk and records object versions.
+        
+        Args:
+            job: Incremental BackupJob
+            
+        Returns:
+            Tuple of (parent backup ID, parent object versions), or None
+        """
+        for candidate in reversed(self.backup_jobs):
+            if (candidate is job or candidate.status != "completed"
+                    or candidate.namespaces != job.namespaces
+                    or candidate.resource_types != job.resource_types
+                    or candidate.include_labels != job.include_labels
+                    or candidate.exclude_labels != job.exclude_labels):
+                continue
+            
+            file_info = self.get_backup_file_info(candidate.id)
+            metadata = self._load_backup_metadata(file_info["path"]) if file_info else None
+            if metadata and "resource_versions" in metadata:
+                return candidate.id, metadata["resource_versions"]
+        
+        return None
+    
+    def _build_label_selector(self, job: BackupJob) -> Tuple[str, Dict[str, str]]:
+        """
+        Translate the job's label filters into a server-side label selector.
+        
+        Include labels always map to ``k=v`` terms. A single exclude label maps
+        to ``k!=v``, which also matches resources without that label. With
+        several exclude labels a resource is only dropped when all of them
+        match, which a selector cannot express, so those stay client-side.
+        
+        Args:
+            job: BackupJob specification
+            
+        Returns:
+            Tuple of (label selector, exclude labels still to filter client-side)
+        """
+        terms = [f"{k}={v}" for k, v in job.include_labels.items()]
+        exclude_labels = job.exclude_labels
+        if len(exclude_labels) == 1:
+            (k, v), = exclude_labels.items()
+            terms.append(f"{k}!={v}")
+            exclude_labels = {}
+        return ",".join(terms), exclude_labels
+    
+    def _backup_resources(self, job: BackupJob, namespace: str, tar: tarfile.TarFile,
+                          label_selector: str = "",
+                          exclude_labels: Optional[Dict[str, str]] = None,
+                          resource_versions: Optional[Dict[str, Dict[str, str]]] = None,
+                          parent_versions: Optional[Dict[str, Dict[str, str]]] = None,
+                          labels_index: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, int]:
         """
         Backup resources of specified types in a namespace.
         
         Args:
             job: BackupJob specification
             namespace: Kubernetes namespace
-            output_dir: Directory to save resource YAML files
+            tar: Archive to write resource YAML files to
+            label_selector: Label selector passed to the list calls
+            exclude_labels: Exclude labels to filter client-side
+            resource_versions: Filled with the resourceVersion of each backed-up object
+            parent_versions: Object versions in the parent backup, for incremental backups
+            labels_index: Filled with the labels of each backed-up object
             
         Returns:
             Dictionary with counts of backed up resources by type
         """
         backup_count = {}
         
-        # Map of resource type to function that retrieves resources
-        resource_functions = {
-            "pods": lambda: self.core_v1.list_namespaced_pod(namespace),
-            "services": lambda: self.core_v1.list_namespaced_service(namespace),
-            "deployments": lambda: self.apps_v1.list_namespaced_deployment(namespace),
-            "statefulsets": lambda: self.apps_v1.list_namespaced_stateful_set(namespace),
-            "daemonsets": lambda: self.apps_v1.list_namespaced_daemon_set(namespace),
-            "replicasets": lambda: self.apps_v1.list_namespaced_replica_set(namespace),
-            "configmaps": lambda: self.core_v1.list_namespaced_config_map(namespace),
-            "secrets": lambda: self.core_v1.list_namespaced_secret(namespace),
-            "ingresses": lambda: self.networking_v1.list_namespaced_ingress(namespace),
-            "jobs": lambda: self.batch_v1.list_namespaced_job(namespace),
-            "cronjobs": lambda: self.batch_v1.list_namespaced_cron_job(namespace),
-            "persistentvolumeclaims": lambda: self.core_v1.list_namespaced_persistent_volume_claim(namespace),
-            "serviceaccounts": lambda: self.core_v1.list_namespaced_service_account(namespace),
-            "roles": lambda: self.rbac_v1.list_namespaced_role(namespace),
-            "rolebindings": lambda: self.rbac_v1.list_namespaced_role_binding(namespace)
+        # Issue all list calls for this namespace concurrently
+        list_pool = self._get_list_pool()
+        futures = {
+            list_pool.submit(self._resource_listers[rt], namespace, label_selector=label_selector): rt
+            for rt in self._expand_resource_types(job.resource_types, self._resource_listers)
         }
         
-        # Process each resource type
-        for resource_type in job.resource_types:
-            if resource_type == "all":
-                resource_types = list(resource_functions.keys())
-            else:
-                resource_types = [resource_type]
+        for future in as_completed(futures):
+            rt = futures[future]
+            try:
+                # Get resources of this type
+                resource_list = future.result()
+                
+                # Handle cases where items might be None
+                if not hasattr(resource_list, 'items') or resource_list.items is None:
+                    logger.warning(f"No items found for resource type {rt} in namespace {namespace}")
+                    continue
+                
+                count = self._save_resources(tar, resource_list.items, f"{namespace}/{rt}", exclude_labels,
+                                             resource_versions, parent_versions, labels_index)
+                if count > 0:
+                    backup_count[rt] = count
+            
+            except ApiException as e:
+                # Resource type might not exist in this namespace or cluster
+                logger.debug(f"Failed to backup {rt} in {namespace}: {e}")
+            except Exception as e:
+                logger.error(f"Unexpected error backing up {rt} in {namespace}: {str(e)}")
+        
+        return backup_count
+    
+    def _backup_all_namespaces(self, job: BackupJob, tar: tarfile.TarFile,
+                               label_selector: str = "",
+                               exclude_labels: Optional[Dict[str, str]] = None,
+                               resource_versions: Optional[Dict[str, Dict[str, str]]] = None,
+                               parent_versions: Optional[Dict[str, Dict[str, str]]] = None,
+                               labels_index: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, int]:
+        """
+        Backup resources of specified types across all non-system namespaces.
+        
+        Issues a single cluster-wide list per resource type and buckets the
+        items by namespace, instead of listing every namespace separately.
+        
+        Args:
+            job: BackupJob specification
+            tar: Archive to write per-namespace resource YAML files to
+            label_selector: Label selector passed to the list calls
+            exclude_labels: Exclude labels to filter client-side
+            resource_versions: Filled with the resourceVersion of each backed-up object
+            parent_versions: Object versions in the parent backup, for incremental backups
+            labels_index: Filled with the labels of each backed-up object
             
-            for rt in resource_types:
-                if rt not in resource_functions:
-                    logger.warning(f"Unsupported resource type: {rt}")
+        Returns:
+            Dictionary with counts of backed up resources by type
+        """
+        backup_count = {}
+        
+        list_pool = self._get_list_pool()
+        futures = {
+            list_pool.submit(self._cluster_listers[rt], label_selector=label_selector): rt
+            for rt in self._expand_resource_types(job.resource_types, self._cluster_listers)
+        }
+        
+        for future in as_completed(futures):
+            rt = futures[future]
+            try:
+                resource_list = future.result()
+                
+                if not hasattr(resource_list, 'items') or resource_list.items is None:
+                    logger.warning(f"No items found for resource type {rt}")
                     continue
                 
-                try:
-                    # Get resources of this type
-                    resource_list = resource_functions[rt]()
-                    
-                    # Handle cases where items might be None
-                    if not hasattr(resource_list, 'items') or resource_list.items is None:
-                        logger.warning(f"No items found for resource type {rt} in namespace {namespace}")
+                # Bucket items by namespace in a single pass
+                by_namespace: Dict[str, List[Any]] = {}
+                for resource in resource_list.items:
+                    ns = resource.metadata.namespace
+                    if ns in _SYSTEM_NAMESPACES:
                         continue
-                    
-                    # Filter by labels if specified
-                    if job.include_labels:
-                        resource_list = [r for r in resource_list.items if self._matches_labels(r, job.include_labels)]
-                    else:
-                        resource_list = resource_list.items
-                    
-                    if job.exclude_labels:
-                        resource_list = [r for r in resource_list if not self._matches_labels(r, job.exclude_labels)]
-                    
-                    # Create directory for resource type
-                    resource_dir = os.path.join(output_dir, rt)
-                    os.makedirs(resource_dir, exist_ok=True)
-                    
-                    # Save each resource
-                    count = 0
-                    for resource in resource_list:
-                        # Clean up resource for backup
-                        resource_dict = self._clean_resource_for_backup(resource.to_dict())
-                        
-                        # Skip empty resources
-                        if not resource_dict:
-                            continue
-                        
-                        # Write resource to file
-                        resource_name = resource.metadata.name
-                        resource_file = os.path.join(resource_dir, f"{resource_name}.yaml")
-                        
-                        with open(resource_file, 'w') as f:
-                            yaml.dump(resource_dict, f, default_flow_style=False)
-                        
-                        count += 1
-                    
+                    by_namespace.setdefault(ns, []).append(resource)
+                
+                for ns, resources in by_namespace.items():
+                    count = self._save_resources(tar, resources, f"{ns}/{rt}", exclude_labels,
+                                                 resource_versions, parent_versions, labels_index)
                     if count > 0:
-                        backup_count[rt] = count
+                        backup_count[rt] = backup_count.get(rt, 0) + count
                 
-                except ApiException as e:
-                    # Resource type might not exist in this namespace or cluster
-                    logger.debug(f"Failed to backup {rt} in {namespace}: {e}")
-                except Exception as e:
-                    logger.error(f"Unexpected error backing up {rt} in {namespace}: {str(e)}")
+                # The list covered every namespace, so namespaces the parent had
+                # and that are now empty were listed too
+                if resource_versions is not None and parent_versions:
+                    for prefix in parent_versions:
+                        if prefix.split("/", 1)[1] == rt:
+                            resource_versions.setdefault(prefix, {})
+            
+            except ApiException as e:
+                logger.debug(f"Failed to backup {rt} across namespaces: {e}")
+            except Exception as e:
+                logger.error(f"Unexpected error backing up {rt} across namespaces: {str(e)}")
         
         return backup_count
     
+    def _expand_resource_types(self, requested: List[str], supported: Dict[str, Any]) -> List[str]:
+        """
+        Expand "all" and drop unsupported entries from a list of resource types.
+        
+        Args:
+            requested: Resource types requested by the job
+            supported: Mapping keyed by supported resource types
+            
+        Returns:
+            De-duplicated list of resource types to process
+        """
+        resource_types = []
+        for resource_type in requested:
+            if resource_type == "all":
+                resource_types.extend(supported.keys())
+            elif resource_type not in supported:
+                logger.warning(f"Unsupported resource type: {resource_type}")
+            else:
+                resource_types.append(resource_type)
+        return list(dict.fromkeys(resource_types))
+    
+    def _save_resources(self, tar: tarfile.TarFile, resources: List[Any], prefix: str,
+                        exclude_labels: Optional[Dict[str, str]] = None,
+                        resource_versions: Optional[Dict[str, Dict[str, str]]] = None,
+                        parent_versions: Optional[Dict[str, Dict[str, str]]] = None,
+                        labels_index: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+        """
+        Write resources to the archive as one multi-document YAML file.
+        
+        Args:
+            tar: Archive to write to
+            resources: Kubernetes resource objects of a single type and namespace,
+                already filtered by the server-side label selector
+            prefix: Archive path for the resources, "<namespace>/<resource_type>"
+            exclude_labels: Exclude labels the selector could not express
+            resource_versions: Filled with the resourceVersion of each backed-up object
+            parent_versions: Object versions in the parent backup; objects whose
+                version is unchanged are not written again
+            labels_index: Filled with the labels of each written object (None for
+                objects without labels), so restores can filter before parsing
+            
+        Returns:
+            Number of resources written
+        """
+        if exclude_labels:
+            resources = [r for r in resources if not self._matches_labels(r, exclude_labels)]
+        
+        versions: Dict[str, str] = {}
+        if resource_versions is not None:
+            resource_versions[prefix] = versions
+        unchanged = parent_versions.get(prefix, {}) if parent_versions else {}
+        labels: Dict[str, Any] = {}
+        
+        docs = []
+        for resource in resources:
+            name = resource.metadata.name
+            version = resource.metadata.resource_version
+            if unchanged and unchanged.get(name) == version:
+                versions[name] = version
+                continue
+            
+            # Clean up resource for backup. sanitize_for_serialization yields the
+            # camelCase, JSON-safe form the API accepts back, in a single pass.
+            resource_dict = self._clean_resource_for_backup(
+                self._api_client.sanitize_for_serialization(resource)
+            )
+            
+            # Skip empty resources
+            if resource_dict:
+                docs.append(resource_dict)
+                versions[name] = version
+                labels[name] = resource_dict.get("metadata", {}).get("labels")
+        
+        if docs:
+            if labels_index is not None:
+                labels_index[prefix] = labels
+            payload = yaml.dump_all(docs, Dumper=_YamlDumper, default_flow_style=False).encode()
+            self._add_to_archive(tar, f"{prefix}.yaml", payload)
+        
+        return len(docs)
+    
+    def _add_to_archive(self, tar: tarfile.TarFile, arcname: str, payload: bytes):
+        """
+        Add an in-memory file to an archive.
+        
+        Args:
+            tar: Archive to write to
+            arcname: Path of the file inside the archive
+            payload: File contents
+        """
+        info = tarfile.TarInfo(arcname)
+        info.size = len(payload)
+        info.mtime = int(time.time())
+        tar.addfile(info, io.BytesIO(payload))
+    
     def _clean_resource_for_backup(self, resource: Dict[str, Any]) -> Dict[str, Any]:
         """
         Clean up a resource for backup by removing fields that are added by the system.
@@ -467,37 +1016,26 @@ class KubernetesBackupManager:
         if not resource:
             return {}
         
-        # Fields to remove from all resources
-        remove_fields = [
-            "status",
-            "metadata.resourceVersion",
-            "metadata.uid",
-            "metadata.selfLink",
-            "metadata.creationTimestamp",
-            "metadata.generation",
-            "metadata.managedFields"
-        ]
+        # Don't include service account token secrets. Items in list responses
+        # carry no "kind", but only Secrets have this top-level type.
+        if resource.get("type") == _SA_TOKEN_SECRET_TYPE:
+            return {}
         
         # Remove fields
-        for field in remove_fields:
-            parts = field.split(".")
-            if len(parts) == 1:
-                resource.pop(parts[0], None)
-            elif len(parts) == 2 and parts[0] in resource and isinstance(resource[parts[0]], dict):
-                resource[parts[0]].pop(parts[1], None)
-        
-        # Handle special cases
-        if "metadata" in resource and "annotations" in resource["metadata"]:
-            # Remove kubernetes.io annotations
-            annotations = resource["metadata"]["annotations"]
-            resource["metadata"]["annotations"] = {
-                k: v for k, v in annotations.items()
-                if not k.startswith("kubernetes.io/")
-            }
+        resource.pop("status", None)
         
-        # For secrets, don't include token secrets
-        if resource.get("kind") == "Secret" and resource.get("type") == "kubernetes.io/service-account-token":
-            return {}  # Skip service account tokens
+        metadata = resource.get("metadata")
+        if isinstance(metadata, dict):
+            for field in _META_DROPS:
+                metadata.pop(field, None)
+            
+            # Remove kubernetes.io annotations
+            annotations = metadata.get("annotations")
+            if annotations:
+                metadata["annotations"] = {
+                    k: v for k, v in annotations.items()
+                    if not k.startswith(_ANN_PREFIX)
+                }
         
         return resource
     
@@ -512,32 +1050,119 @@ class KubernetesBackupManager:
         Returns:
             True if the resource matches all labels, False otherwise
         """
-        if not hasattr(resource, "metadata") or not resource.metadata.labels:
+        resource_labels = resource.metadata.labels if hasattr(resource, "metadata") else None
+        if not resource_labels:
             return False
         
-        resource_labels = resource.metadata.labels
+        return labels.items() <= resource_labels.items()
+    
+    @contextlib.contextmanager
+    def _open_archive(self, path: str, mode: str):
+        """
+        Open a backup archive for sequential reading or writing.
         
-        for key, value in labels.items():
-            if key not in resource_labels or resource_labels[key] != value:
-                return False
+        The compression is picked from the file suffix: ".tar.zst" archives go
+        through zstandard (multi-threaded when writing), anything else is gzip.
         
-        return True
+        Args:
+            path: Path to the archive
+            mode: "r" to read or "w" to write
+            
+        Yields:
+            Open TarFile
+        """
+        is_zstd = path.endswith(_ARCHIVE_SUFFIXES["zstd"])
+        if is_zstd and not ZSTD_AVAILABLE:
+            raise RuntimeError(f"zstandard is required to open {os.path.basename(path)}")
+        
+        # A large write buffer batches the compressor's small writes
+        buffering = 1 << 20 if mode == "w" else -1
+        with open(path, f"{mode}b", buffering=buffering) as raw, contextlib.ExitStack() as stack:
+            fileobj = raw
+            if mode == "r" and os.name == "posix" and os.fstat(raw.fileno()).st_size:
+                # Read through a read-only mapping so the kernel pages the
+                # archive in with readahead instead of copying it via read()
+                fileobj = stack.enter_context(mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ))
+                # The archive is read front to back exactly once, so ask for
+                # aggressive readahead and early reclaim of consumed pages
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    fileobj.madvise(mmap.MADV_SEQUENTIAL)
+            
+            if not is_zstd:
+                # tarfile compresses at level 9 by default; 6 is much cheaper
+                # for a barely larger archive
+                kwargs = {"compresslevel": 6} if mode == "w" else {}
+                with tarfile.open(fileobj=fileobj, mode=f"{mode}:gz", **kwargs) as tar:
+                    yield tar
+                return
+            
+            if mode == "w":
+                zf = zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(fileobj)
+            else:
+                zf = zstandard.ZstdDecompressor().stream_reader(fileobj)
+            # zstd streams are not seekable, so the tarfile runs in stream mode
+            with zf, tarfile.open(fileobj=zf, mode=f"{mode}|") as tar:
+                yield tar
+    
+    def _load_backup_metadata(self, archive_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a backup's metadata from the sidecar file next to its archive.
+        
+        Args:
+            archive_path: Path to the backup archive
+            
+        Returns:
+            Metadata dictionary, or None if there is no readable sidecar
+            (e.g. for backups created before sidecars were written)
+        """
+        try:
+            with open(archive_path + _METADATA_SIDECAR_SUFFIX, 'rb') as f:
+                return _load_json(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable metadata sidecar for {os.path.basename(archive_path)}: {e}")
+            return None
     
     def _enforce_backup_retention(self):
         """Enforce backup retention policy by deleting old backups."""
-        backup_files = sorted([
-            f for f in os.listdir(self.backup_dir)
-            if f.endswith(".tar.gz")
-        ], key=lambda x: os.path.getmtime(os.path.join(self.backup_dir, x)))
+        # scandir entries cache their stat result, so sorting by mtime does
+        # not cost a stat call per comparison key
+        with os.scandir(self.backup_dir) as it:
+            backup_files = [e for e in it if e.is_file() and e.name.endswith(_ARCHIVE_EXTENSIONS)]
+        backup_files.sort(key=lambda e: e.stat().st_mtime)
         
         # If we have more backups than the limit, delete the oldest ones
         if len(backup_files) > self.max_backups:
+            # Keep the parents incremental backups still depend on
+            required = set()
+            for entry in backup_files[-self.max_backups:]:
+                metadata = self._load_backup_metadata(entry.path)
+                while metadata and metadata.get("parent_backup_id") and metadata["parent_backup_id"] not in required:
+                    required.add(metadata["parent_backup_id"])
+                    parent_info = self.get_backup_file_info(metadata["parent_backup_id"])
+                    metadata = self._load_backup_metadata(parent_info["path"]) if parent_info else None
+            
             for old_file in backup_files[:-self.max_backups]:
+                if old_file.name.split("_", 1)[0] in required:
+                    continue
                 try:
-                    os.remove(os.path.join(self.backup_dir, old_file))
-                    logger.info(f"Deleted old backup: {old_file}")
+                    os.remove(old_file.path)
+                    self._remove_sidecars(old_file.path)
+                    old_id = old_file.name.split("_", 1)[0]
+                    if self._backup_files.get(old_id) == old_file.path:
+                        del self._backup_files[old_id]
+                    logger.info(f"Deleted old backup: {old_file.name}")
                 except Exception as e:
-                    logger.error(f"Failed to delete old backup {old_file}: {e}")
+                    logger.error(f"Failed to delete old backup {old_file.name}: {e}")
+    
+    def _remove_sidecars(self, archive_path: str):
+        """Remove the metadata sidecar and parse cache of an archive, if present."""
+        for suffix in (_METADATA_SIDECAR_SUFFIX, _PARSE_CACHE_SUFFIX):
+            try:
+                os.remove(archive_path + suffix)
+            except FileNotFoundError:
+                pass
     
     def restore_from_backup(self, job: RestoreJob) -> RestoreJob:
         """
@@ -555,89 +1180,67 @@ class KubernetesBackupManager:
         logger.info(f"Starting restore job: {job.name} from backup {job.backup_id}")
         job.status = "running"
         self.restore_jobs.append(job)
-        self._save_history()
+        self._schedule_history_save()
         
         try:
-            # Find the backup file
-            backup_file = None
-            for f in os.listdir(self.backup_dir):
-                if f.startswith(f"{job.backup_id}_") and f.endswith(".tar.gz"):
-                    backup_file = os.path.join(self.backup_dir, f)
-                    break
-            
-            if not backup_file:
-                raise FileNotFoundError(f"Backup with ID {job.backup_id} not found")
+            # Incremental backups only hold changes, so restore the whole chain
+            # of archives back to the last full backup, oldest first
+            chain = self._resolve_backup_chain(job.backup_id)
             
             # Create a temporary directory for extraction
             with tempfile.TemporaryDirectory() as temp_dir:
-                # Extract the backup
-                with tarfile.open(backup_file, "r:gz") as tar:
-                    tar.extractall(path=temp_dir)
-                
-                # Load metadata
-                metadata_file = os.path.join(temp_dir, "metadata.json")
-                if not os.path.exists(metadata_file):
-                    raise FileNotFoundError("Metadata file not found in backup")
+                # Latest definition of each resource, keyed by (namespace, type, name)
+                resources: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+                namespaces: List[str] = []
+                for index, (backup_id, backup_file) in enumerate(chain):
+                    extract_dir = os.path.join(temp_dir, str(index))
+                    for namespace in self._read_backup_resources(job, backup_id, backup_file,
+                                                                 extract_dir, resources):
+                        if namespace not in namespaces:
+                            namespaces.append(namespace)
                 
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
+                # Ensure namespaces exist before anything is applied into them
+                for namespace in namespaces:
+                    self._ensure_namespace_exists(namespace)
                 
-                # Validate backup
-                if metadata.get("backup_id") != job.backup_id:
-                    logger.warning(f"Backup ID mismatch: expected {job.backup_id}, got {metadata.get('backup_id')}")
+                # Resolve which types can be applied once per type, rather than
+                # failing the dispatch lookup (and warning) for every resource
+                unsupported = {rt for _, rt, _ in resources if rt not in self._api_functions}
+                for resource_type in sorted(unsupported):
+                    logger.warning(f"Unsupported resource type: {resource_type}")
+                if unsupported:
+                    resources = {key: resource for key, resource in resources.items()
+                                 if key[1] not in unsupported}
                 
-                # Determine namespaces to restore
-                if "all" in job.namespaces:
-                    namespaces = metadata.get("namespaces", [])
-                    if "all" in namespaces:
-                        namespaces = [d for d in os.listdir(temp_dir) 
-                                     if os.path.isdir(os.path.join(temp_dir, d))
-                                     and d != "metadata.json"]
-                else:
-                    namespaces = job.namespaces
+                # One LIST per namespace and type tells which resources already
+                # exist, instead of a GET per resource. Server-side apply (used
+                # for create_or_replace) does not care, so skip the lists then.
+                existing: Dict[Tuple[str, str], Set[str]] = {}
+                if job.restore_strategy != "create_or_replace":
+                    existing = self._list_existing_names({(ns, rt) for ns, rt, _ in resources})
                 
-                # Determine resource types to restore
-                if not job.resource_types or "all" in job.resource_types:
-                    resource_types = metadata.get("resource_types", [])
-                    if "all" in resource_types:
-                        # Get all resource types from the backup
-                        resource_types = set()
-                        for ns in namespaces:
-                            ns_dir = os.path.join(temp_dir, ns)
-                            if os.path.isdir(ns_dir):
-                                resource_types.update([d for d in os.listdir(ns_dir) 
-                                                     if os.path.isdir(os.path.join(ns_dir, d))])
-                        resource_types = list(resource_types)
-                else:
-                    resource_types = job.resource_types
+                # Apply resources concurrently on the bounded restore pool, so a
+                # large restore does not flood the API server. Results are
+                # tallied here on the calling thread, so the counts need no lock.
+                include_items = _label_items(job.include_labels)
+                exclude_items = _label_items(job.exclude_labels)
+                restore_pool = self._get_restore_pool()
+                futures = {
+                    restore_pool.submit(self._restore_resource, namespace, resource_type, resource,
+                                        job.restore_strategy, include_items, exclude_items,
+                                        existing.get((namespace, resource_type))): resource_type
+                    for (namespace, resource_type, _), resource in resources.items()
+                }
                 
-                # Process each namespace
-                for namespace in namespaces:
-                    # Ensure namespace exists
-                    self._ensure_namespace_exists(namespace)
-                    
-                    # Process each resource type
-                    for resource_type in resource_types:
-                        resource_dir = os.path.join(temp_dir, namespace, resource_type)
-                        if not os.path.isdir(resource_dir):
-                            continue
-                        
-                        # Process each resource file
-                        for resource_file in os.listdir(resource_dir):
-                            if not resource_file.endswith(".yaml"):
-                                continue
-                            
-                            resource_path = os.path.join(resource_dir, resource_file)
-                            
-                            # Restore the resource
-                            restored = self._restore_resource(namespace, resource_type, resource_path, 
-                                                          job.restore_strategy, job.include_labels, job.exclude_labels)
-                            
-                            if restored:
-                                # Update job statistics
-                                if resource_type not in job.resources_restored:
-                                    job.resources_restored[resource_type] = 0
-                                job.resources_restored[resource_type] += 1
+                resources_restored: Dict[str, int] = {}
+                for future in as_completed(futures):
+                    if future.result():
+                        # Update job statistics
+                        resource_type = futures[future]
+                        if resource_type not in resources_restored:
+                            resources_restored[resource_type] = 0
+                        resources_restored[resource_type] += 1
+                job.resources_restored = resources_restored
                 
                 # Update job status
                 total_restored = sum(job.resources_restored.values())
@@ -657,6 +1260,120 @@ class KubernetesBackupManager:
         
         return job
     
+    async def restore_from_backup_async(self, job: RestoreJob) -> RestoreJob:
+        """
+        Restore Kubernetes resources from a backup without blocking the event loop.
+        
+        The restore runs on the event loop's default executor; its API calls
+        fan out on the restore pool as with restore_from_backup.
+        
+        Args:
+            job: RestoreJob specification
+            
+        Returns:
+            Updated RestoreJob with results
+        """
+        # asyncio.to_thread would need Python 3.9
+        return await asyncio.get_running_loop().run_in_executor(None, self.restore_from_backup, job)
+    
+    def _resolve_backup_chain(self, backup_id: str) -> List[Tuple[str, str]]:
+        """
+        Resolve a backup and the parents it was taken incrementally against.
+        
+        Args:
+            backup_id: Backup job ID
+            
+        Returns:
+            List of (backup ID, archive path), starting with the full backup
+        """
+        chain: List[Tuple[str, str]] = []
+        while backup_id:
+            if any(backup_id == seen for seen, _ in chain):
+                raise ValueError(f"Backup chain of {chain[0][0]} loops at {backup_id}")
+            
+            file_info = self.get_backup_file_info(backup_id)
+            if not file_info:
+                if chain:
+                    raise FileNotFoundError(f"Parent backup {backup_id} of {chain[-1][0]} not found")
+                raise FileNotFoundError(f"Backup with ID {backup_id} not found")
+            chain.append((backup_id, file_info["path"]))
+            
+            metadata = self._load_backup_metadata(file_info["path"])
+            backup_id = metadata.get("parent_backup_id") if metadata else None
+        
+        chain.reverse()
+        return chain
+    
+    def _read_backup_resources(self, job: RestoreJob, backup_id: str, backup_file: str,
+                               extract_dir: str, resources: Dict[Tuple[str, str, str], Dict[str, Any]]) -> List[str]:
+        """
+        Read one backup archive and merge the resources it holds.
+        
+        The archive's parse cache is used while it is current; otherwise the
+        archive is extracted and parsed, and the cache is rewritten when the
+        whole archive was read.
+        
+        Args:
+            job: RestoreJob specification
+            backup_id: ID of the backup stored in the archive
+            backup_file: Path to the backup archive
+            extract_dir: Directory to extract the archive to on a cache miss
+            resources: Resources keyed by (namespace, type, name); updated with the
+                archive's resources and with the deletions it records
+            
+        Returns:
+            Namespaces to restore from this archive
+        """
+        parsed = self._load_parse_cache(backup_file)
+        if parsed is not None:
+            metadata = parsed["metadata"]
+            archived = parsed["resources"]
+        else:
+            metadata, archived, complete = self._extract_backup_resources(job, backup_file, extract_dir)
+            if complete:
+                self._write_parse_cache(backup_file, metadata, archived)
+        
+        # Validate backup
+        if metadata.get("backup_id") != backup_id:
+            logger.warning(f"Backup ID mismatch: expected {backup_id}, got {metadata.get('backup_id')}")
+        
+        # Determine namespaces to restore
+        if "all" in job.namespaces:
+            namespaces = metadata.get("namespaces", [])
+            if "all" in namespaces:
+                namespaces = list(dict.fromkeys(prefix.split("/", 1)[0] for prefix in archived))
+        else:
+            namespaces = job.namespaces
+        
+        # Determine resource types to restore
+        if not job.resource_types or "all" in job.resource_types:
+            resource_types = metadata.get("resource_types", [])
+            if "all" in resource_types:
+                # Get all resource types from the backup
+                wanted = set(namespaces)
+                resource_types = list(dict.fromkeys(
+                    resource_type
+                    for namespace, resource_type in (prefix.split("/", 1) for prefix in archived)
+                    if namespace in wanted
+                ))
+        else:
+            resource_types = job.resource_types
+        
+        # Collect the resources, newer archives overriding older ones
+        for namespace in namespaces:
+            for resource_type in resource_types:
+                for resource in archived.get(f"{namespace}/{resource_type}", ()):
+                    name = resource.get("metadata", {}).get("name")
+                    resources[(namespace, resource_type, name)] = resource
+        
+        # Drop resources that were deleted by the time this backup was taken
+        for prefix, names in metadata.get("deleted", {}).items():
+            namespace, resource_type = prefix.split("/", 1)
+            for name in names:
+                resources.pop((namespace, resource_type, name), None)
+        
+        return namespaces
+    
     def _ensure_namespace_exists(self, namespace: str):
         """
         Ensure that a namespace exists, creating it if necessary.
@@ -678,105 +1395,312 @@ class KubernetesBackupManager:
             else:
                 raise
     
-    def _restore_resource(self, namespace: str, resource_type: str, resource_file: str, 
-                        strategy: str, include_labels: Dict[str, str], exclude_labels: Dict[str, str]) -> bool:
+    def _extract_backup_resources(self, job: RestoreJob, backup_file: str, extract_dir: str
+                                  ) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]], bool]:
         """
-        Restore a single resource from a file.
+        Extract a backup archive and parse the resources it holds.
+        
+        Args:
+            job: RestoreJob specification, used to skip unneeded members
+            backup_file: Path to the backup archive
+            extract_dir: Directory to extract the archive to
+            
+        Returns:
+            Tuple of the backup metadata, the parsed resources keyed by
+            "<namespace>/<type>", and whether every member was extracted
+        """
+        # Only extract the namespaces and resource types being restored
+        wanted_namespaces = None if "all" in job.namespaces else set(job.namespaces)
+        wanted_types = (None if not job.resource_types or "all" in job.resource_types
+                        else set(job.resource_types))
+        
+        # Skip files none of whose resources pass the label filters, going by
+        # the labels index recorded in the metadata sidecar
+        metadata = self._load_backup_metadata(backup_file)
+        filtered_out: Set[str] = set()
+        if metadata and (job.include_labels or job.exclude_labels):
+            include_items = _label_items(job.include_labels)
+            exclude_items = _label_items(job.exclude_labels)
+            filtered_out = {
+                prefix for prefix, labels in metadata.get("labels_index", {}).items()
+                if not any(_passes_label_filter(l, include_items, exclude_items) for l in labels.values())
+            }
+        
+        # Extract the backup in a single forward pass, filtering members
+        # inline. Never look members up by name (getmember/extractfile on
+        # a chosen member): gzip has no random access, so every lookup
+        # re-decompresses the stream from the start. zstd archives are
+        # read as a stream too; random access into them would need a
+        # seekable, independently-compressed frame layout.
+        complete = True
+        with self._open_archive(backup_file, "r") as tar:
+            for member in tar:
+                # Resources live at <ns>/<type>.yaml, or at
+                # <ns>/<type>/<name>.yaml in older backups
+                parts = member.name.split("/")
+                if len(parts) >= 2:
+                    resource_type = parts[1]
+                    if len(parts) == 2 and resource_type.endswith(".yaml"):
+                        resource_type = resource_type[:-len(".yaml")]
+                    if ((wanted_namespaces is not None and parts[0] not in wanted_namespaces)
+                            or (wanted_types is not None and resource_type not in wanted_types)
+                            or f"{parts[0]}/{resource_type}" in filtered_out):
+                        complete = False
+                        continue
+                if _TAR_DATA_FILTER:
+                    tar.extract(member, path=extract_dir, filter="data")
+                else:
+                    tar.extract(_checked_member(member), path=extract_dir)
+        
+        # Fall back to the archived metadata for backups without a sidecar
+        if metadata is None:
+            metadata_file = os.path.join(extract_dir, "metadata.json")
+            if not os.path.exists(metadata_file):
+                raise FileNotFoundError("Metadata file not found in backup")
+            
+            with open(metadata_file, 'rb') as f:
+                metadata = _load_json(f.read())
+        
+        archived: Dict[str, List[Dict[str, Any]]] = {}
+        for namespace in sorted(os.listdir(extract_dir)):
+            ns_dir = os.path.join(extract_dir, namespace)
+            if not os.path.isdir(ns_dir):
+                continue
+            for entry in sorted(os.listdir(ns_dir)):
+                path = os.path.join(ns_dir, entry)
+                if entry.endswith(".yaml"):
+                    archived.setdefault(f"{namespace}/{entry[:-len('.yaml')]}", []).extend(
+                        self._load_resources(path))
+                elif os.path.isdir(path):
+                    # Older backups keep one file per resource
+                    docs = archived.setdefault(f"{namespace}/{entry}", [])
+                    for name in sorted(os.listdir(path)):
+                        if name.endswith(".yaml"):
+                            docs.extend(self._load_resources(os.path.join(path, name)))
+        
+        return metadata, archived, complete
+    
+    def _load_parse_cache(self, archive_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the parsed resources of an archive from its JSON cache.
+        
+        Args:
+            archive_path: Path to the backup archive
+            
+        Returns:
+            Cached metadata and resources, or None if there is no cache or the
+            archive changed since it was written
+        """
+        try:
+            st = os.stat(archive_path)
+            with open(archive_path + _PARSE_CACHE_SUFFIX, 'rb') as f:
+                cached = _load_json(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parse cache for {os.path.basename(archive_path)}: {e}")
+            return None
+        
+        if cached.get("size") != st.st_size or cached.get("mtime_ns") != st.st_mtime_ns:
+            return None
+        return cached
+    
+    def _write_parse_cache(self, archive_path: str, metadata: Dict[str, Any],
+                           resources: Dict[str, List[Dict[str, Any]]]):
+        """
+        Cache the parsed resources of an archive as JSON next to it.
+        
+        JSON loads many times faster than YAML parses, so later restores from
+        the same archive skip both decompression and YAML parsing.
+        
+        Args:
+            archive_path: Path to the backup archive
+            metadata: Backup metadata
+            resources: Parsed resources keyed by "<namespace>/<type>"
+        """
+        try:
+            st = os.stat(archive_path)
+            payload = _dump_json({
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "metadata": metadata,
+                "resources": resources
+            })
+            tmp_path = archive_path + _PARSE_CACHE_SUFFIX + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, archive_path + _PARSE_CACHE_SUFFIX)
+        except Exception as e:
+            logger.warning(f"Failed to write parse cache for {os.path.basename(archive_path)}: {e}")
+    
+    def _load_resources(self, resource_file: str) -> List[Dict[str, Any]]:
+        """
+        Load the resources stored in a YAML file.
+        
+        Args:
+            resource_file: Path to a single- or multi-document YAML file
+            
+        Returns:
+            List of resource dictionaries; empty if the file could not be read
+        """
+        try:
+            with open(resource_file, 'r') as f:
+                return [doc for doc in yaml.load_all(f, Loader=_YamlLoader) if doc]
+        except Exception as e:
+            logger.error(f"Failed to load resources from {resource_file}: {e}")
+            return []
+    
+    def _list_existing_names(self, keys: Set[Tuple[str, str]]) -> Dict[Tuple[str, str], Set[str]]:
+        """
+        List the names of resources that currently exist in the cluster.
+        
+        Args:
+            keys: (namespace, resource type) pairs to list
+            
+        Returns:
+            Names of existing resources by (namespace, resource type). Pairs
+            that could not be listed are left out.
+        """
+        list_pool = self._get_list_pool()
+        futures = {
+            list_pool.submit(self._resource_listers[rt], ns): (ns, rt)
+            for ns, rt in keys if rt in self._resource_listers
+        }
+        
+        existing = {}
+        for future in as_completed(futures):
+            ns, rt = futures[future]
+            try:
+                existing[(ns, rt)] = {item.metadata.name for item in future.result().items or []}
+            except ApiException as e:
+                # Fall back to checking resources one by one
+                logger.debug(f"Failed to list {rt} in {ns}: {e}")
+        
+        return existing
+    
+    def _restore_resource(self, namespace: str, resource_type: str, resource: Dict[str, Any],
+                        strategy: str, include_items: FrozenSet[Tuple[str, str]],
+                        exclude_items: FrozenSet[Tuple[str, str]],
+                        existing: Optional[Set[str]] = None) -> bool:
+        """
+        Restore a single resource.
         
         Args:
             namespace: Namespace for the resource
             resource_type: Type of resource
-            resource_file: Path to the resource YAML file
+            resource: Resource definition loaded from the backup
             strategy: Restore strategy ("create_or_replace", "create_only", "replace_only")
-            include_labels: Labels that resources must have to be restored
-            exclude_labels: Labels that resources must not have to be restored
+            include_items: (key, value) labels that resources must have to be restored
+            exclude_items: (key, value) labels that resources must not have to be restored
+            existing: Names of the resources of this type that exist in the
+                namespace, if known
             
         Returns:
             True if the resource was restored, False otherwise
         """
         try:
-            # Load resource from file
-            with open(resource_file, 'r') as f:
-                resource = yaml.safe_load(f)
-            
-            # Skip if resource is empty
-            if not resource:
-                return False
-            
             # Check labels if specified
-            if include_labels and "metadata" in resource and "labels" in resource["metadata"]:
-                resource_labels = resource["metadata"]["labels"]
-                if not all(key in resource_labels and resource_labels[key] == value 
-                          for key, value in include_labels.items()):
-                    return False
-            
-            if exclude_labels and "metadata" in resource and "labels" in resource["metadata"]:
-                resource_labels = resource["metadata"]["labels"]
-                if any(key in resource_labels and resource_labels[key] == value 
-                      for key, value in exclude_labels.items()):
-                    return False
+            if not _passes_label_filter(resource.get("metadata", {}).get("labels"), include_items, exclude_items):
+                return False
             
             # Set namespace in resource metadata
             if "metadata" in resource:
                 resource["metadata"]["namespace"] = namespace
             
             # Create the resource in Kubernetes
-            return self._apply_resource(namespace, resource_type, resource, strategy)
+            return self._apply_resource(namespace, resource_type, resource, strategy, existing)
         
         except Exception as e:
-            resource_name = os.path.basename(resource_file).replace(".yaml", "")
+            resource_name = resource.get("metadata", {}).get("name")
             logger.error(f"Failed to restore {resource_type}/{resource_name} in {namespace}: {e}")
             return False
     
-    def _apply_resource(self, namespace: str, resource_type: str, resource: Dict[str, Any], strategy: str) -> bool:
+    def _dynamic_resource(self, resource_type: str) -> Any:
+        """
+        Resolve the dynamic client's API resource for a resource type.
+        
+        The dynamic client is created on the first call, and each type is
+        resolved once.
+        
+        Args:
+            resource_type: Type of resource
+            
+        Returns:
+            Dynamic client resource for the type
+        """
+        api_resource = self._dynamic_resources.get(resource_type)
+        if api_resource is None:
+            with self._dynamic_lock:
+                if self._dynamic_client is None:
+                    self._dynamic_client = dynamic.DynamicClient(self._api_client)
+                api_resource = self._dynamic_resources.get(resource_type)
+                if api_resource is None:
+                    api_version, kind = _RESOURCE_KINDS[resource_type]
+                    api_resource = self._dynamic_client.resources.get(api_version=api_version, kind=kind)
+                    self._dynamic_resources[resource_type] = api_resource
+        return api_resource
+    
+    def _apply_resource(self, namespace: str, resource_type: str, resource: Dict[str, Any], strategy: str,
+                        existing: Optional[Set[str]] = None) -> bool:
         """
         Apply a resource to the Kubernetes cluster.
         
+        create_or_replace uses server-side apply, which merges the backed-up
+        fields into a resource that already exists: its fields are restored
+        as backed up, but fields set on the live object that the backup does
+        not have (labels, annotations, data keys added since) are kept rather
+        than removed. replace_only replaces the whole object.
+        
         Args:
             namespace: Namespace for the resource
             resource_type: Type of resource
             resource: Resource definition
             strategy: Restore strategy
+            existing: Names of the resources of this type that exist in the
+                namespace; when not given, existence is checked with a GET
             
         Returns:
             True if the resource was applied, False otherwise
         """
-        # Map of resource type to API function
-        api_functions = {
-            "pods": (self.core_v1.create_namespaced_pod, self.core_v1.replace_namespaced_pod, self.core_v1.read_namespaced_pod),
-            "services": (self.core_v1.create_namespaced_service, self.core_v1.replace_namespaced_service, self.core_v1.read_namespaced_service),
-            "deployments": (self.apps_v1.create_namespaced_deployment, self.apps_v1.replace_namespaced_deployment, self.apps_v1.read_namespaced_deployment),
-            "statefulsets": (self.apps_v1.create_namespaced_stateful_set, self.apps_v1.replace_namespaced_stateful_set, self.apps_v1.read_namespaced_stateful_set),
-            "daemonsets": (self.apps_v1.create_namespaced_daemon_set, self.apps_v1.replace_namespaced_daemon_set, self.apps_v1.read_namespaced_daemon_set),
-            "replicasets": (self.apps_v1.create_namespaced_replica_set, self.apps_v1.replace_namespaced_replica_set, self.apps_v1.read_namespaced_replica_set),
-            "configmaps": (self.core_v1.create_namespaced_config_map, self.core_v1.replace_namespaced_config_map, self.core_v1.read_namespaced_config_map),
-            "secrets": (self.core_v1.create_namespaced_secret, self.core_v1.replace_namespaced_secret, self.core_v1.read_namespaced_secret),
-            "ingresses": (self.networking_v1.create_namespaced_ingress, self.networking_v1.replace_namespaced_ingress, self.networking_v1.read_namespaced_ingress),
-            "jobs": (self.batch_v1.create_namespaced_job, self.batch_v1.replace_namespaced_job, self.batch_v1.read_namespaced_job),
-            "cronjobs": (self.batch_v1.create_namespaced_cron_job, self.batch_v1.replace_namespaced_cron_job, self.batch_v1.read_namespaced_cron_job),
-            "persistentvolumeclaims": (self.core_v1.create_namespaced_persistent_volume_claim, self.core_v1.replace_namespaced_persistent_volume_claim, self.core_v1.read_namespaced_persistent_volume_claim),
-            "serviceaccounts": (self.core_v1.create_namespaced_service_account, self.core_v1.replace_namespaced_service_account, self.core_v1.read_namespaced_service_account),
-            "roles": (self.rbac_v1.create_namespaced_role, self.rbac_v1.replace_namespaced_role, self.rbac_v1.read_namespaced_role),
-            "rolebindings": (self.rbac_v1.create_namespaced_role_binding, self.rbac_v1.replace_namespaced_role_binding, self.rbac_v1.read_namespaced_role_binding)
-        }
         
-        if resource_type not in api_functions:
+        functions = self._api_functions.get(resource_type)
+        if functions is None:
             logger.warning(f"Unsupported resource type: {resource_type}")
             return False
         
-        create_func, replace_func, read_func = api_functions[resource_type]
+        create_func, replace_func, read_func = functions
         resource_name = resource["metadata"]["name"]
         
         try:
+            if strategy == "create_or_replace":
+                # Server-side apply creates or updates the resource in a single
+                # idempotent request, so no existence check is needed. It merges
+                # rather than replaces: fields only the live object has are kept
+                api_version, kind = _RESOURCE_KINDS[resource_type]
+                resource.setdefault("apiVersion", api_version)
+                resource.setdefault("kind", kind)
+                api_resource = self._dynamic_resource(resource_type)
+                self._dynamic_client.server_side_apply(
+                    api_resource, body=resource, namespace=namespace,
+                    field_manager=_FIELD_MANAGER, force_conflicts=True
+                )
+                if existing is not None:
+                    existing.add(resource_name)
+                logger.info(f"Applied {resource_type}/{resource_name} in {namespace}")
+                return True
+            
             # Check if resource exists
-            exists = True
-            try:
-                read_func(name=resource_name, namespace=namespace)
-            except ApiException as e:
-                if e.status == 404:
-                    exists = False
-                else:
-                    raise
+            if existing is not None:
+                exists = resource_name in existing
+            else:
+                exists = True
+                try:
+                    read_func(name=resource_name, namespace=namespace)
+                except ApiException as e:
+                    if e.status == 404:
+                        exists = False
+                    else:
+                        raise
             
             # Apply based on strategy
             if strategy == "create_only" and exists:
@@ -795,6 +1719,8 @@ class KubernetesBackupManager:
             else:
                 if strategy in ["create_or_replace", "create_only"]:
                     create_func(namespace=namespace, body=resource)
+                    if existing is not None:
+                        existing.add(resource_name)
                     logger.info(f"Created {resource_type}/{resource_name} in {namespace}")
                     return True
         
@@ -832,10 +1758,12 @@ class KubernetesBackupManager:
         Returns:
             BackupJob if found, None otherwise
         """
-        for job in self.backup_jobs:
-            if job.id == backup_id:
-                return job
-        return None
+        return self._backup_jobs_by_id.get(backup_id)
+    
+    def _add_backup_job(self, job: BackupJob):
+        """Record a backup job in the history and the ID index."""
+        self.backup_jobs.append(job)
+        self._backup_jobs_by_id[job.id] = job
     
     def get_backup_file_info(self, backup_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -847,17 +1775,34 @@ class KubernetesBackupManager:
         Returns:
             Dictionary with file information if found, None otherwise
         """
-        for f in os.listdir(self.backup_dir):
-            if f.startswith(f"{backup_id}_") and f.endswith(".tar.gz"):
-                file_path = os.path.join(self.backup_dir, f)
-                return {
-                    "filename": f,
-                    "path": file_path,
-                    "size": os.path.getsize(file_path),
-                    "created": datetime.fromtimestamp(os.path.getctime(file_path)).isoformat()
-                }
+        for attempt in range(2):
+            file_path = self._backup_files.get(backup_id)
+            if file_path is not None:
+                try:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
+                    pass
+                else:
+                    return {
+                        "filename": os.path.basename(file_path),
+                        "path": file_path,
+                        "size": st.st_size,
+                        "created": datetime.fromtimestamp(st.st_ctime).isoformat()
+                    }
+            # The archive may have been created or removed by another process
+            if attempt == 0:
+                self._scan_backup_files()
         return None
     
+    def _scan_backup_files(self):
+        """Rebuild the backup ID -> archive path index from backup_dir."""
+        # scandir gets the file type from the directory listing itself, so
+        # filtering out non-files needs no stat call per entry
+        with os.scandir(self.backup_dir) as it:
+            entries = sorted((e for e in it if "_" in e.name and e.name.endswith(_ARCHIVE_EXTENSIONS)
+                              and e.is_file()), key=lambda e: e.name)
+        self._backup_files = {e.name.split("_", 1)[0]: e.path for e in entries}
+    
     def delete_backup(self, backup_id: str) -> bool:
         """
         Delete a backup and its associated file.
@@ -868,18 +1813,27 @@ class KubernetesBackupManager:
         Returns:
             True if the backup was deleted, False otherwise
         """
+        dependents = [job.id for job in self.backup_jobs if job.parent_backup_id == backup_id]
+        if dependents:
+            logger.warning(f"Incremental backups {', '.join(dependents)} depend on backup {backup_id} "
+                           f"and can no longer be restored once it is deleted")
+        
         # Delete the backup file
         file_info = self.get_backup_file_info(backup_id)
         if file_info:
             try:
                 os.remove(file_info["path"])
+                self._remove_sidecars(file_info["path"])
+                self._backup_files.pop(backup_id, None)
                 logger.info(f"Deleted backup file: {file_info['filename']}")
             except Exception as e:
                 logger.error(f"Failed to delete backup file {file_info['filename']}: {e}")
                 return False
         
         # Remove from job history
-        self.backup_jobs = [job for job in self.backup_jobs if job.id != backup_id]
+        job = self._backup_jobs_by_id.pop(backup_id, None)
+        if job is not None:
+            self.backup_jobs.remove(job)
         self._save_history()
         
         return True
@@ -890,6 +1844,7 @@ class KubernetesBackupManager:
         import uuid
         
         logger.info("Generating mock backup data")
+        now = datetime.now()
         
         # Generate sample backup jobs
         namespaces = ["default", "kube-system", "application", "monitoring"]
@@ -902,9 +1857,9 @@ class KubernetesBackupManager:
             # Create a backup from a few days/hours ago
             days_ago = random.randint(0, 30)
             hours_ago = random.randint(0, 23)
-            timestamp = (datetime.now() - 
+            timestamp = (now - 
                         (days_ago * timedelta(days=1)) - 
-                        (hours_ago * timedelta(hours=1))).isoformat()
+                        (hours_ago * timedelta(hours=1))).isoformat(timespec="seconds")
             
             # Random selection of namespaces and resource types
             selected_namespaces = random.sample(namespaces, 
@@ -923,15 +1878,12 @@ class KubernetesBackupManager:
             )
             
             # Add random resource counts
-            resources_backed_up = {}
-            for resource_type in selected_resources:
-                resources_backed_up[resource_type] = random.randint(1, 15)
-            backup_job.resources_backed_up = resources_backed_up
+            backup_job.resources_backed_up = {rt: random.randint(1, 15) for rt in selected_resources}
             
             # Add random file size (1-100 MB)
             backup_job.file_size = random.randint(1, 100) * 1024 * 1024
             
-            self.backup_jobs.append(backup_job)
+            self._add_backup_job(backup_job)
         
         # Create 1-3 mock restore jobs
         for i in range(random.randint(1, 3)):
@@ -942,8 +1894,8 @@ class KubernetesBackupManager:
                 restore_id = str(uuid.uuid4())
                 # Create a restore from a few hours ago
                 hours_ago = random.randint(0, 12)
-                timestamp = (datetime.now() - 
-                            (hours_ago * timedelta(hours=1))).isoformat()
+                timestamp = (now - 
+                            (hours_ago * timedelta(hours=1))).isoformat(timespec="seconds")
                 
                 # Create the restore job
                 restore_job = RestoreJob(
@@ -957,41 +1909,44 @@ class KubernetesBackupManager:
                 )
                 
                 # Add random resource counts (subset of backup)
-                resources_restored = {}
-                for resource_type, count in source_backup.resources_backed_up.items():
-                    resources_restored[resource_type] = random.randint(1, count)
-                restore_job.resources_restored = resources_restored
+                restore_job.resources_restored = self._mock_restored_counts(
+                    source_backup.resources_backed_up
+                )
                 
                 self.restore_jobs.append(restore_job)
         
         # Save the mock history
         self._save_history()
 
+    def _mock_restored_counts(self, backed_up: Dict[str, int]) -> Dict[str, int]:
+        """Draw a random restored count between 1 and the backed-up count for each type."""
+        import random
+        
+        return {rt: random.randint(1, count) for rt, count in backed_up.items()}
+    
     def _create_mock_backup(self, job: BackupJob) -> BackupJob:
         """Create a mock backup for testing."""
         import random
-        import time
         
         logger.info(f"Creating mock backup: {job.name}")
         
         # Simulate a backup process
         job.status = "running"
         
-        # Simulate work
-        time.sleep(0.5)
+        # Simulate work, if asked to
+        if self.mock_delay:
+            time.sleep(self.mock_delay)
         
         # Generate random resource counts
-        resources_backed_up = {}
+        resource_types = []
         for resource_type in job.resource_types:
             # If "all" is specified, use some common resource types
             if resource_type == "all":
-                common_types = ["deployments", "services", "pods", "configmaps", "secrets"]
-                for common_type in common_types:
-                    resources_backed_up[common_type] = random.randint(1, 15)
+                resource_types.extend(["deployments", "services", "pods", "configmaps", "secrets"])
             else:
-                resources_backed_up[resource_type] = random.randint(1, 15)
+                resource_types.append(resource_type)
         
-        job.resources_backed_up = resources_backed_up
+        job.resources_backed_up = {rt: random.randint(1, 15) for rt in resource_types}
         
         # Add random file size (1-100 MB)
         job.file_size = random.randint(1, 100) * 1024 * 1024
@@ -1000,25 +1955,17 @@ class KubernetesBackupManager:
         job.status = "completed"
         
         # Add to history
-        self.backup_jobs.append(job)
+        self._add_backup_job(job)
         self._save_history()
         
         return job
 
     def _create_mock_restore(self, job: RestoreJob) -> RestoreJob:
         """Create a mock restore for testing."""
-        import random
-        import time
-        
         logger.info(f"Creating mock restore: {job.name}")
         
         # First, find the referenced backup
-        source_backup = None
-        for backup in self.backup_jobs:
-            if backup.id == job.backup_id:
-                source_backup = backup
-                break
-        
+        source_backup = self._backup_jobs_by_id.get(job.backup_id)
         if not source_backup:
             job.status = "failed"
             job.error_message = f"Backup with ID {job.backup_id} not found"
@@ -1027,19 +1974,17 @@ class KubernetesBackupManager:
         # Simulate a restore process
         job.status = "running"
         
-        # Simulate work
-        time.sleep(0.5)
+        # Simulate work, if asked to
+        if self.mock_delay:
+            time.sleep(self.mock_delay)
         
         # Generate random resource counts (subset of backup)
-        resources_restored = {}
-        for resource_type, count in source_backup.resources_backed_up.items():
-            # If resource types filter is specified, only include those
-            if job.resource_types and resource_type not in job.resource_types and "all" not in job.resource_types:
-                continue
-            
-            resources_restored[resource_type] = random.randint(1, count)
+        backed_up = source_backup.resources_backed_up
+        # If resource types filter is specified, only include those
+        if job.resource_types and "all" not in job.resource_types:
+            backed_up = {rt: count for rt, count in backed_up.items() if rt in job.resource_types}
         
-        job.resources_restored = resources_restored
+        job.resources_restored = self._mock_restored_counts(backed_up)
         
         # Mark as completed
         job.status = "completed"
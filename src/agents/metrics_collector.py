@@ -7,17 +7,72 @@ to support prediction and analysis capabilities.
 
 import logging
 import time
-from typing import Dict, List, Optional, Any
+from typing import Deque, Dict, Optional, Any
+from collections import deque
 from datetime import datetime
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
+from functools import lru_cache
 
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+
+def _dump_json_line(data: Any) -> bytes:
+    """Serialize data to one newline-terminated line of compact JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(data, separators=(",", ":")).encode() + b"\n"
+
+
+def _load_json(payload: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+# Quantity suffixes, looked up by the last two characters (binary) and then
+# the last one (decimal): multiples give the multiplier, fractions the divisor
+_BINARY_SUFFIXES = {"Ki": 1 << 10, "Mi": 1 << 20, "Gi": 1 << 30, "Ti": 1 << 40}
+_DECIMAL_MULTIPLIERS = {"k": 1e3, "K": 1e3, "M": 1e6, "G": 1e9, "T": 1e12}
+_DECIMAL_DIVISORS = {"m": 1e3, "u": 1e6, "n": 1e9}
+
+
+@lru_cache(maxsize=4096)
+def _parse_resource_quantity(quantity: str) -> float:
+    """Parse Kubernetes resource quantity string into a float value."""
+    try:
+        multiplier = _BINARY_SUFFIXES.get(quantity[-2:])
+        if multiplier:
+            return float(quantity[:-2]) * multiplier
+        multiplier = _DECIMAL_MULTIPLIERS.get(quantity[-1:])
+        if multiplier:
+            return float(quantity[:-1]) * multiplier
+        divisor = _DECIMAL_DIVISORS.get(quantity[-1:])
+        if divisor:
+            return float(quantity[:-1]) / divisor
+        return float(quantity)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+# Usage readings from metrics-server rarely repeat, so they are parsed
+# without the cache, which then keeps the recurring capacity and limit
+# quantities
+_parse_usage_quantity = _parse_resource_quantity.__wrapped__
+
+
 class KubernetesMetricsCollector:
     """
     Collects metrics from Kubernetes clusters for analysis and prediction.
@@ -51,8 +106,16 @@ class KubernetesMetricsCollector:
         self.use_mock = use_mock
         self.running = False
         self.collection_thread = None
-        self.metrics_history = []
         self.max_history_size = 1000
+        # Appending past max_history_size drops the oldest sample
+        self.metrics_history: Deque[Dict[str, Any]] = deque(maxlen=self.max_history_size)
+        # Number of lines in the history file (None when it must be rewritten
+        # before appending)
+        self._history_lines: Optional[int] = 0
+        # Runs the node, pod and cluster queries of a collection side by
+        # side; created on the first collection, released by close()
+        self._pool_lock = threading.Lock()
+        self._query_pool: Optional[ThreadPoolExecutor] = None
         
         if self.use_mock:
             # Mock mode, no real Kubernetes client
@@ -109,7 +172,7 @@ class KubernetesMetricsCollector:
         self._load_metrics_history()
     
     def _load_metrics_history(self):
-        """Load metrics history from file."""
+        """Load the most recent samples from the history file."""
         if not self.metrics_history_file:
             return
         
@@ -118,14 +181,23 @@ class KubernetesMetricsCollector:
             history_file.parent.mkdir(parents=True, exist_ok=True)
             
             if history_file.exists():
-                with open(history_file, "r") as f:
-                    self.metrics_history = json.load(f)
+                data = history_file.read_bytes()
+                if data.lstrip().startswith(b"["):
+                    # Older releases wrote the history as one JSON array
+                    samples = _load_json(data)
+                    self._history_lines = None
+                else:
+                    # One sample per line
+                    samples = [_load_json(line) for line in data.splitlines() if line.strip()]
+                    self._history_lines = len(samples)
+                self.metrics_history = deque(samples, maxlen=self.max_history_size)
             else:
-                self.metrics_history = []
+                self.metrics_history = deque(maxlen=self.max_history_size)
             
             logger.debug(f"Loaded metrics history from {self.metrics_history_file}")
         except Exception as e:
             logger.error(f"Error loading metrics history: {e}")
+            self._history_lines = None
     
     def start_collection_loop(self):
         """Start the background metrics collection loop."""
@@ -149,12 +221,32 @@ class KubernetesMetricsCollector:
         if self.collection_thread:
             self.collection_thread.join(timeout=5.0)
         
-        # Save metrics history if configured
-        if self.metrics_history_file:
+        # Compact the history file down to the in-memory samples, unless it
+        # already holds exactly those
+        if self.metrics_history_file and self._history_lines != len(self.metrics_history):
             self._save_metrics_history()
         
+        self.close()
         logger.info("Stopped metrics collection loop")
     
+    def _get_query_pool(self) -> ThreadPoolExecutor:
+        """Pool for a collection's concurrent queries, created on first use."""
+        with self._pool_lock:
+            if self._query_pool is None:
+                self._query_pool = ThreadPoolExecutor(max_workers=3)
+            return self._query_pool
+    
+    def close(self):
+        """
+        Release the query pool's threads.
+        
+        The collector stays usable: the next collection starts a new pool.
+        """
+        with self._pool_lock:
+            query_pool, self._query_pool = self._query_pool, None
+        if query_pool is not None:
+            query_pool.shutdown(wait=False)
+    
     def _collection_loop(self):
         """Background loop for collecting metrics at regular intervals."""
         while self.running:
@@ -162,13 +254,8 @@ class KubernetesMetricsCollector:
                 metrics = self.collect_metrics()
                 self.metrics_history.append(metrics)
                 
-                # Trim history if needed
-                if len(self.metrics_history) > self.max_history_size:
-                    self.metrics_history.pop(0)
-                
-                # Save history periodically
-                if self.metrics_history_file and len(self.metrics_history) % 10 == 0:
-                    self._save_metrics_history()
+                if self.metrics_history_file:
+                    self._append_metrics_history(metrics)
                 
                 logger.debug("Collected metrics successfully")
             except Exception as e:
@@ -200,8 +287,15 @@ class KubernetesMetricsCollector:
         }
         
         try:
+            # The node, pod and cluster queries are independent, so issue them
+            # together; a collection then takes as long as the slowest one
+            query_pool = self._get_query_pool()
+            node_future = query_pool.submit(self._get_node_metrics)
+            pod_future = query_pool.submit(self._get_pod_metrics)
+            cluster_future = query_pool.submit(self._get_cluster_metrics)
+            
             # Get node metrics
-            node_metrics = self._get_node_metrics()
+            node_metrics = node_future.result()
             
             # Format metrics for ClusterMetrics model
             for node_name, node_data in node_metrics.items():
@@ -214,7 +308,7 @@ class KubernetesMetricsCollector:
                 metrics["network_io"][node_name] = node_data.get("network_io", {"in": 0.0, "out": 0.0})
             
             # Get pod metrics
-            pod_metrics = self._get_pod_metrics()
+            pod_metrics = pod_future.result()
             
             # Format pod metrics for ClusterMetrics model
             for pod_name, pod_data in pod_metrics.items():
@@ -222,7 +316,7 @@ class KubernetesMetricsCollector:
                 metrics["pod_status"][pod_name] = pod_data.get("status", "Unknown")
             
             # Get cluster-level metrics
-            cluster_metrics = self._get_cluster_metrics()
+            cluster_metrics = cluster_future.result()
             
             # Add cluster as a "node" for average metrics
             metrics["cpu_usage"]["cluster"] = cluster_metrics.get("total_cpu_usage", 0.0)
@@ -263,8 +357,16 @@ class KubernetesMetricsCollector:
             # Get node information
             nodes = self.v1.list_node()
             
+            # Capacities come with the node list; parse them once here rather
+            # than fetching each node again for every metrics entry
+            node_capacity = {}
+            
             for node in nodes.items:
                 node_name = node.metadata.name
+                node_capacity[node_name] = (
+                    self._parse_resource_quantity(node.status.capacity["cpu"]),
+                    self._parse_resource_quantity(node.status.capacity["memory"])
+                )
                 node_metrics[node_name] = {
                     "cpu_usage": 0.0,
                     "memory_usage": 0.0,
@@ -288,12 +390,10 @@ class KubernetesMetricsCollector:
                     node_name = metric["metadata"]["name"]
                     if node_name in node_metrics:
                         # Convert resource usage to percentages
-                        node_info = self.v1.read_node(node_name)
-                        cpu_capacity = self._parse_resource_quantity(node_info.status.capacity["cpu"])
-                        memory_capacity = self._parse_resource_quantity(node_info.status.capacity["memory"])
+                        cpu_capacity, memory_capacity = node_capacity[node_name]
                         
-                        cpu_usage = self._parse_resource_quantity(metric["usage"]["cpu"])
-                        memory_usage = self._parse_resource_quantity(metric["usage"]["memory"])
+                        cpu_usage = _parse_usage_quantity(metric["usage"]["cpu"])
+                        memory_usage = _parse_usage_quantity(metric["usage"]["memory"])
                         
                         node_metrics[node_name]["cpu_usage"] = (cpu_usage / cpu_capacity) * 100
                         node_metrics[node_name]["memory_usage"] = (memory_usage / memory_capacity) * 100
@@ -324,6 +424,10 @@ class KubernetesMetricsCollector:
             # Get pod information
             pods = self.v1.list_pod_for_all_namespaces()
             
+            # Parsed CPU and memory limits by (pod, container), taken from the
+            # pod list instead of fetching each pod again
+            container_limits = {}
+            
             for pod in pods.items:
                 pod_name = f"{pod.metadata.namespace}/{pod.metadata.name}"
                 pod_metrics[pod_name] = {
@@ -341,6 +445,12 @@ class KubernetesMetricsCollector:
                         "memory_usage": 0.0,
                         "restart_count": 0
                     }
+                    
+                    limits = (container.resources.limits if container.resources else None) or {}
+                    container_limits[(pod_name, container.name)] = (
+                        self._parse_resource_quantity(limits.get("cpu", "0")),
+                        self._parse_resource_quantity(limits.get("memory", "0"))
+                    )
             
             # Get pod metrics from metrics-server
             try:
@@ -355,32 +465,19 @@ class KubernetesMetricsCollector:
                             container_name = container["name"]
                             if container_name in pod_metrics[pod_name]["containers"]:
                                 # Convert resource usage to percentages
-                                pod_info = self.v1.read_namespaced_pod(
-                                    metric["metadata"]["name"],
-                                    metric["metadata"]["namespace"]
-                                )
+                                cpu_limit, memory_limit = container_limits[(pod_name, container_name)]
                                 
-                                # Find container spec
-                                container_spec = next(
-                                    (c for c in pod_info.spec.containers if c.name == container_name),
-                                    None
-                                )
+                                cpu_usage = _parse_usage_quantity(container["usage"]["cpu"])
+                                memory_usage = _parse_usage_quantity(container["usage"]["memory"])
                                 
-                                if container_spec:
-                                    cpu_limit = self._parse_resource_quantity(container_spec.resources.limits.get("cpu", "0"))
-                                    memory_limit = self._parse_resource_quantity(container_spec.resources.limits.get("memory", "0"))
-                                    
-                                    cpu_usage = self._parse_resource_quantity(container["usage"]["cpu"])
-                                    memory_usage = self._parse_resource_quantity(container["usage"]["memory"])
-                                    
-                                    if cpu_limit > 0:
-                                        pod_metrics[pod_name]["containers"][container_name]["cpu_usage"] = (cpu_usage / cpu_limit) * 100
-                                    if memory_limit > 0:
-                                        pod_metrics[pod_name]["containers"][container_name]["memory_usage"] = (memory_usage / memory_limit) * 100
-                                    
-                                    # Update pod-level metrics
-                                    pod_metrics[pod_name]["cpu_usage"] += pod_metrics[pod_name]["containers"][container_name]["cpu_usage"]
-                                    pod_metrics[pod_name]["memory_usage"] += pod_metrics[pod_name]["containers"][container_name]["memory_usage"]
+                                if cpu_limit > 0:
+                                    pod_metrics[pod_name]["containers"][container_name]["cpu_usage"] = (cpu_usage / cpu_limit) * 100
+                                if memory_limit > 0:
+                                    pod_metrics[pod_name]["containers"][container_name]["memory_usage"] = (memory_usage / memory_limit) * 100
+                                
+                                # Update pod-level metrics
+                                pod_metrics[pod_name]["cpu_usage"] += pod_metrics[pod_name]["containers"][container_name]["cpu_usage"]
+                                pod_metrics[pod_name]["memory_usage"] += pod_metrics[pod_name]["containers"][container_name]["memory_usage"]
             except ApiException as e:
                 logger.warning(f"Could not get pod metrics from metrics-server: {e}")
             
@@ -423,26 +520,34 @@ class KubernetesMetricsCollector:
             total_memory_usage = 0.0
             node_count = 0
             
+            # Usage of every node from one metrics-server list, by node name
+            try:
+                usage_by_node = {
+                    metric["metadata"]["name"]: metric
+                    for metric in self.metrics_api.list_cluster_custom_object(
+                        "metrics.k8s.io", "v1beta1", "nodes"
+                    )["items"]
+                }
+            except ApiException:
+                usage_by_node = {}
+            
             for node in nodes.items:
-                try:
-                    node_metrics = self.metrics_api.get_cluster_custom_object(
-                        "metrics.k8s.io", "v1beta1", "nodes", node.metadata.name
-                    )
-                    
-                    cpu_capacity = self._parse_resource_quantity(node.status.capacity["cpu"])
-                    memory_capacity = self._parse_resource_quantity(node.status.capacity["memory"])
-                    
-                    cpu_usage = self._parse_resource_quantity(node_metrics["usage"]["cpu"])
-                    memory_usage = self._parse_resource_quantity(node_metrics["usage"]["memory"])
-                    
-                    if cpu_capacity > 0:
-                        total_cpu_usage += (cpu_usage / cpu_capacity) * 100
-                    if memory_capacity > 0:
-                        total_memory_usage += (memory_usage / memory_capacity) * 100
-                    
-                    node_count += 1
-                except ApiException:
+                node_metrics = usage_by_node.get(node.metadata.name)
+                if node_metrics is None:
                     continue
+                
+                cpu_capacity = self._parse_resource_quantity(node.status.capacity["cpu"])
+                memory_capacity = self._parse_resource_quantity(node.status.capacity["memory"])
+                
+                cpu_usage = _parse_usage_quantity(node_metrics["usage"]["cpu"])
+                memory_usage = _parse_usage_quantity(node_metrics["usage"]["memory"])
+                
+                if cpu_capacity > 0:
+                    total_cpu_usage += (cpu_usage / cpu_capacity) * 100
+                if memory_capacity > 0:
+                    total_memory_usage += (memory_usage / memory_capacity) * 100
+                
+                node_count += 1
             
             if node_count > 0:
                 cluster_metrics["total_cpu_usage"] = total_cpu_usage / node_count
@@ -455,22 +560,10 @@ class KubernetesMetricsCollector:
     
     def _parse_resource_quantity(self, quantity: str) -> float:
         """Parse Kubernetes resource quantity string into a float value."""
-        try:
-            if quantity.endswith("m"):
-                return float(quantity[:-1]) / 1000
-            elif quantity.endswith("Ki"):
-                return float(quantity[:-2]) * 1024
-            elif quantity.endswith("Mi"):
-                return float(quantity[:-2]) * 1024 * 1024
-            elif quantity.endswith("Gi"):
-                return float(quantity[:-2]) * 1024 * 1024 * 1024
-            else:
-                return float(quantity)
-        except (ValueError, TypeError):
-            return 0.0
+        return _parse_resource_quantity(quantity)
     
     def _save_metrics_history(self):
-        """Save metrics history to file."""
+        """Rewrite the history file from the in-memory history, one JSON sample per line."""
         if not self.metrics_history_file:
             return
         
@@ -478,13 +571,37 @@ class KubernetesMetricsCollector:
             history_file = Path(self.metrics_history_file)
             history_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(history_file, "w") as f:
-                json.dump(self.metrics_history, f, indent=2)
+            samples = list(self.metrics_history)
+            tmp_file = history_file.with_name(history_file.name + ".tmp")
+            with open(tmp_file, "wb") as f:
+                f.write(b"".join(map(_dump_json_line, samples)))
+            tmp_file.replace(history_file)
+            self._history_lines = len(samples)
             
             logger.debug(f"Saved metrics history to {self.metrics_history_file}")
         except Exception as e:
             logger.error(f"Error saving metrics history: {e}")
     
+    def _append_metrics_history(self, metrics: Dict[str, Any]):
+        """
+        Append one sample to the history file.
+        
+        The file is rewritten from the in-memory history instead when it is
+        not yet in the line format or has grown to twice max_history_size
+        lines, so it never holds much more than the history it is loaded into.
+        """
+        if self._history_lines is None or self._history_lines >= 2 * self.max_history_size:
+            self._save_metrics_history()
+            return
+        
+        try:
+            with open(self.metrics_history_file, "ab") as f:
+                f.write(_dump_json_line(metrics))
+            self._history_lines += 1
+        except Exception as e:
+            logger.error(f"Error appending to metrics history: {e}")
+            self._history_lines = None
+    
     def get_formatted_metrics(self) -> Dict[str, Any]:
         """
         Get the latest metrics in a format suitable for the predictor.
@@ -154,7 +154,7 @@ class KubernetesPredictor:
                 history_file.parent.mkdir(parents=True, exist_ok=True)
                 
                 with open(history_file, "w") as f:
-                    json.dump([m.dict() for m in self.metrics_history], f, indent=2)
+                    json.dump([m.dict() for m in self.metrics_history], f, separators=(",", ":"))
                 
                 logger.debug(f"Saved metrics history to {self.history_file}")
             except Exception as e:
@@ -472,7 +472,7 @@ class KubernetesSecurityScanner:
             history_file.parent.mkdir(parents=True, exist_ok=True)
             
             with open(history_file, "w") as f:
-                json.dump(self.scan_history, f, indent=2)
+                json.dump(self.scan_history, f, separators=(",", ":"))
             
             logger.debug(f"Saved scan history to {self.history_file}")
         except Exception as e:
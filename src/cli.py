@@ -97,12 +97,6 @@ from kagent.tools.prometheus._prometheus import (
     TSDBStatusTool,
 )
 
-from kagent.services.k8s_prediction_service import KubernetesPredictionService
-from kagent.agents.security_scanner import KubernetesSecurityScanner
-from kagent.agents.cost_optimizer import KubernetesCostOptimizer
-from kagent.agents.backup_manager import KubernetesBackupManager, BackupJob, RestoreJob
-from kagent.tools.utils.train_model import train_and_save_model
-
 import uuid
 
 # Configure rich logging
@@ -357,6 +351,8 @@ def predict(
     use_mock: bool = typer.Option(False, help="Use mock data instead of real Kubernetes cluster"),
 ):
     """Start the Kubernetes prediction service."""
+    from kagent.services.k8s_prediction_service import KubernetesPredictionService
+    
     # Expand home directory if needed
     history_file = os.path.expanduser(history_file)
     
@@ -422,6 +418,8 @@ def k8s_status(
     kubeconfig: str = typer.Option(None, help="Path to kubeconfig file"),
 ):
     """Show current Kubernetes cluster status."""
+    from kagent.services.k8s_prediction_service import KubernetesPredictionService
+    
     console.print("[bold]Checking Kubernetes cluster status...[/bold]")
     
     try:
@@ -489,6 +487,8 @@ def security_scan(
     history_file: str = typer.Option("~/.kagent/security_history.json", help="Path to store scan history"),
 ):
     """Run a security scan on the Kubernetes cluster"""
+    from kagent.agents.security_scanner import KubernetesSecurityScanner
+    
     logger.info("Starting security scan")
     
     try:
@@ -549,8 +549,11 @@ def optimize_costs(
     cloud_provider: str = typer.Option("aws", help="Cloud provider (aws, gcp, azure)"),
 ):
     """Analyze cluster resources for cost optimization opportunities"""
+    from kagent.agents.cost_optimizer import KubernetesCostOptimizer
+    
     logger.info("Starting cost optimization analysis")
     
+    optimizer = None
     try:
         # Initialize optimizer
         optimizer = KubernetesCostOptimizer(
@@ -616,6 +619,10 @@ def optimize_costs(
         logger.error(f"Error performing cost optimization: {e}")
         console.print(f"[bold red]Error:[/bold red] {e}")
         sys.exit(1)
+    finally:
+        if optimizer is not None:
+            # Stop the watch caches the analysis started
+            optimizer.close()
 
 @app.command()
 def backup_resources(
@@ -627,10 +634,15 @@ def backup_resources(
     kubeconfig: str = typer.Option(None, help="Path to kubeconfig file"),
     backup_dir: str = typer.Option("~/.kagent/backups", help="Directory to store backups"),
     history_file: str = typer.Option("~/.kagent/backup_history.json", help="Path to store backup history"),
+    compression: str = typer.Option("gz", help="Archive compression: gz or zstd (zstd needs the zstandard package)"),
+    incremental: bool = typer.Option(False, help="Only store changes since the last backup with the same scope"),
 ):
     """Create a backup of Kubernetes resources"""
+    from kagent.agents.backup_manager import KubernetesBackupManager, BackupJob
+    
     logger.info(f"Starting backup: {name}")
     
+    backup_manager = None
     try:
         # Parse namespaces and resource types
         namespace_list = [ns.strip() for ns in namespaces.split(",")]
@@ -653,7 +665,8 @@ def backup_resources(
         backup_manager = KubernetesBackupManager(
             kubeconfig_path=kubeconfig,
             backup_dir=os.path.expanduser(backup_dir),
-            history_file=os.path.expanduser(history_file)
+            history_file=os.path.expanduser(history_file),
+            compression=compression
         )
         
         # Create backup job
@@ -664,7 +677,8 @@ def backup_resources(
             namespaces=namespace_list,
             resource_types=resource_type_list,
             include_labels=include_label_dict,
-            exclude_labels=exclude_label_dict
+            exclude_labels=exclude_label_dict,
+            incremental=incremental
         )
         
         # Run backup
@@ -676,6 +690,8 @@ def backup_resources(
             console.print(f"\n[bold green]Backup completed successfully[/bold green]")
             console.print(f"Backup ID: {result.id}")
             console.print(f"Backup Name: {result.name}")
+            if result.parent_backup_id:
+                console.print(f"Incremental, based on backup: {result.parent_backup_id}")
             console.print(f"Resources backed up:")
             
             for resource_type, count in result.resources_backed_up.items():
@@ -691,6 +707,9 @@ def backup_resources(
         logger.error(f"Error creating backup: {e}")
         console.print(f"[bold red]Error:[/bold red] {e}")
         sys.exit(1)
+    finally:
+        if backup_manager is not None:
+            backup_manager.close()
 
 @app.command()
 def list_backups(
@@ -700,6 +719,9 @@ def list_backups(
     output_format: str = typer.Option("table", help="Output format: table, json")
 ):
     """List available backups"""
+    from kagent.agents.backup_manager import KubernetesBackupManager
+    
+    backup_manager = None
     try:
         # Initialize backup manager
         backup_manager = KubernetesBackupManager(
@@ -749,6 +771,9 @@ def list_backups(
         logger.error(f"Error listing backups: {e}")
         console.print(f"[bold red]Error:[/bold red] {e}")
         sys.exit(1)
+    finally:
+        if backup_manager is not None:
+            backup_manager.close()
 
 @app.command()
 def restore_backup(
@@ -758,14 +783,18 @@ def restore_backup(
     resource_types: str = typer.Option("all", help="Comma-separated list of resource types to restore (default: all)"),
     include_labels: str = typer.Option(None, help="Comma-separated list of labels to include (format: key=value)"),
     exclude_labels: str = typer.Option(None, help="Comma-separated list of labels to exclude (format: key=value)"),
-    restore_strategy: str = typer.Option("create_or_replace", help="Restore strategy: create_or_replace, create_only, replace_only"),
+    restore_strategy: str = typer.Option("create_or_replace", help="Restore strategy: create_or_replace (server-side apply; keeps fields added to live resources since the backup), create_only, replace_only"),
     kubeconfig: str = typer.Option(None, help="Path to kubeconfig file"),
     backup_dir: str = typer.Option("~/.kagent/backups", help="Directory with backups"),
     history_file: str = typer.Option("~/.kagent/backup_history.json", help="Path to backup history file"),
+    parallelism: int = typer.Option(16, help="Maximum number of resources to restore concurrently"),
 ):
     """Restore resources from a backup"""
+    from kagent.agents.backup_manager import KubernetesBackupManager, RestoreJob
+    
     logger.info(f"Starting restore from backup {backup_id}")
     
+    backup_manager = None
     try:
         # Parse namespaces and resource types
         namespace_list = [ns.strip() for ns in namespaces.split(",")]
@@ -788,7 +817,8 @@ def restore_backup(
         backup_manager = KubernetesBackupManager(
             kubeconfig_path=kubeconfig,
             backup_dir=os.path.expanduser(backup_dir),
-            history_file=os.path.expanduser(history_file)
+            history_file=os.path.expanduser(history_file),
+            parallelism=parallelism
         )
         
         # Check if backup exists
@@ -831,6 +861,9 @@ def restore_backup(
         logger.error(f"Error restoring from backup: {e}")
         console.print(f"[bold red]Error:[/bold red] {e}")
         sys.exit(1)
+    finally:
+        if backup_manager is not None:
+            backup_manager.close()
 
 @app.command()
 def train_model(
@@ -843,6 +876,8 @@ def train_model(
     This command trains an Isolation Forest model to detect anomalies in Kubernetes
     cluster metrics and saves it to be used by the predictor agent.
     """
+    from kagent.tools.utils.train_model import train_and_save_model
+    
     try:
         model_path = train_and_save_model(output_path, contamination)
         console.print(f"[green]Model successfully trained and saved to:[/green] {model_path}")
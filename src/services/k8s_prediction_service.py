@@ -188,6 +188,10 @@ class KubernetesPredictionService:
         if self._prediction_thread:
             self._prediction_thread.join(timeout=5)
             self._prediction_thread = None
+        
+        # The prediction loop collects too, so release the query pool once
+        # it has stopped
+        self.metrics_collector.close()
             
         # Stop security scanning if enabled
         if self.security_scanner:
@@ -197,6 +201,10 @@ class KubernetesPredictionService:
         if self.cost_optimizer:
             self.cost_optimizer.stop_analysis_loop()
         
+        # Release the backup manager's pools and connections
+        if self.backup_manager:
+            self.backup_manager.close()
+        
         logger.info("Stopped KubernetesPredictionService")
     
     def _prediction_loop(self):
@@ -281,7 +289,7 @@ class KubernetesPredictionService:
             history_file.parent.mkdir(parents=True, exist_ok=True)
             
             with open(history_file, "w") as f:
-                json.dump(self._prediction_history, f, indent=2)
+                json.dump(self._prediction_history, f, separators=(",", ":"))
             
             logger.debug(f"Saved prediction history to {self.history_file}")
         except Exception as e:
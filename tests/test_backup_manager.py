@@ -0,0 +1,286 @@
+"""
+Tests for incremental backups, restores and the restore parse cache in the
+backup manager, run against fake list calls instead of a cluster
+"""
+
+import io
+import json
+import os
+import sys
+import tarfile
+import time
+
+import pytest
+from kubernetes import client, config
+
+# Add the source directory to the Python path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from agents import backup_manager
+from agents.backup_manager import KubernetesBackupManager, BackupJob, RestoreJob
+
+
+class FakeCluster:
+    """ConfigMaps by (namespace, name), listed the way the API client would"""
+
+    def __init__(self):
+        self.configmaps = {}
+        self._version = 0
+
+    def put(self, namespace, name, data):
+        self._version += 1
+        self.configmaps[(namespace, name)] = client.V1ConfigMap(
+            metadata=client.V1ObjectMeta(name=name, namespace=namespace,
+                                         resource_version=str(self._version)),
+            data=data
+        )
+
+    def delete(self, namespace, name):
+        del self.configmaps[(namespace, name)]
+
+    def list_all(self, label_selector=""):
+        return client.V1ConfigMapList(items=list(self.configmaps.values()))
+
+    def list_namespaced(self, namespace, label_selector=""):
+        return client.V1ConfigMapList(
+            items=[cm for (ns, _), cm in self.configmaps.items() if ns == namespace])
+
+
+@pytest.fixture
+def cluster():
+    return FakeCluster()
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch, cluster):
+    # Real API client objects, but every call the tests make is faked below
+    monkeypatch.setattr(config, "load_kube_config", lambda *args, **kwargs: None)
+    manager = KubernetesBackupManager(backup_dir=str(tmp_path / "backups"), max_backups=10)
+    manager._cluster_listers = {"configmaps": cluster.list_all}
+    manager._resource_listers = {"configmaps": cluster.list_namespaced}
+    manager._api_functions = {"configmaps": None}
+
+    # Record what a restore would apply instead of calling the API server
+    manager.applied = {}
+
+    def apply(namespace, resource_type, resource, strategy, existing=None):
+        manager.applied[(namespace, resource_type, resource["metadata"]["name"])] = resource.get("data")
+        return True
+
+    manager._apply_resource = apply
+    manager._ensure_namespace_exists = lambda namespace: None
+    yield manager
+    manager.close()
+
+
+def backup(manager, backup_id, incremental=False):
+    job = manager.create_backup(BackupJob(id=backup_id, name="test", namespaces=["all"],
+                                          resource_types=["all"], incremental=incremental))
+    assert job.status == "completed", job.error_message
+    return job
+
+
+def restore(manager, backup_id):
+    manager.applied = {}
+    job = manager.restore_from_backup(RestoreJob(id=f"restore-{backup_id}", backup_id=backup_id,
+                                                 name="test", namespaces=["all"]))
+    assert job.status == "completed", job.error_message
+    return manager.applied
+
+
+def archive_path(manager, backup_id):
+    return manager.get_backup_file_info(backup_id)["path"]
+
+
+def age_archive(manager, backup_id, seconds_ago):
+    """Backdate an archive, so retention sees it as older than later backups"""
+    stamp = time.time() - seconds_ago
+    os.utime(archive_path(manager, backup_id), (stamp, stamp))
+
+
+def test_incremental_backup_stores_only_changes(manager, cluster):
+    for i in range(3):
+        cluster.put("app", f"cm{i}", {"k": str(i)})
+    cluster.put("gone", "g", {"k": "g"})
+    full = backup(manager, "b1")
+    assert full.parent_backup_id is None
+    assert full.resources_backed_up == {"configmaps": 4}
+
+    cluster.put("app", "cm1", {"k": "changed"})
+    cluster.delete("app", "cm2")
+    cluster.delete("gone", "g")
+    cluster.put("app", "cm3", {"k": "3"})
+    incremental = backup(manager, "b2", incremental=True)
+
+    assert incremental.parent_backup_id == "b1"
+    assert incremental.resources_backed_up == {"configmaps": 2}
+    metadata = manager._load_backup_metadata(archive_path(manager, "b2"))
+    assert metadata["deleted"] == {"app/configmaps": ["cm2"], "gone/configmaps": ["g"]}
+    assert set(metadata["resource_versions"]["app/configmaps"]) == {"cm0", "cm1", "cm3"}
+
+    assert [backup_id for backup_id, _ in manager._resolve_backup_chain("b2")] == ["b1", "b2"]
+
+
+def test_restoring_incremental_backup_merges_the_chain(manager, cluster):
+    for i in range(3):
+        cluster.put("app", f"cm{i}", {"k": str(i)})
+    cluster.put("gone", "g", {"k": "g"})
+    backup(manager, "b1")
+
+    cluster.put("app", "cm1", {"k": "changed"})
+    cluster.delete("app", "cm2")
+    cluster.delete("gone", "g")
+    cluster.put("app", "cm3", {"k": "3"})
+    backup(manager, "b2", incremental=True)
+
+    cluster.put("app", "cm0", {"k": "changed again"})
+    third = backup(manager, "b3", incremental=True)
+    assert third.parent_backup_id == "b2"
+    assert third.resources_backed_up == {"configmaps": 1}
+
+    assert restore(manager, "b3") == {
+        ("app", "configmaps", "cm0"): {"k": "changed again"},
+        ("app", "configmaps", "cm1"): {"k": "changed"},
+        ("app", "configmaps", "cm3"): {"k": "3"},
+    }
+    # Restoring the middle of the chain still sees cm0 as it was then
+    assert restore(manager, "b2")[("app", "configmaps", "cm0")] == {"k": "0"}
+
+
+def test_incremental_without_parent_is_full(manager, cluster):
+    cluster.put("app", "cm0", {"k": "0"})
+    job = backup(manager, "b1", incremental=True)
+    assert job.parent_backup_id is None
+    assert job.resources_backed_up == {"configmaps": 1}
+
+
+def test_retention_keeps_parents_of_kept_backups(manager, cluster):
+    manager.max_backups = 1
+    cluster.put("app", "cm0", {"k": "0"})
+    backup(manager, "b1")
+    age_archive(manager, "b1", 20)
+
+    cluster.put("app", "cm1", {"k": "1"})
+    backup(manager, "b2", incremental=True)
+
+    # Over the limit, but b2 cannot be restored without b1
+    assert os.path.exists(archive_path(manager, "b1"))
+    assert os.path.exists(archive_path(manager, "b2"))
+    paths = {backup_id: archive_path(manager, backup_id) for backup_id in ("b1", "b2")}
+    age_archive(manager, "b2", 10)
+
+    # A new full backup frees the whole chain
+    backup(manager, "b3")
+    assert not os.path.exists(paths["b1"])
+    assert not os.path.exists(paths["b2"])
+    assert os.path.exists(archive_path(manager, "b3"))
+
+
+def test_parse_cache_hit_matches_fresh_extract(manager, cluster, tmp_path):
+    for i in range(3):
+        cluster.put("app", f"cm{i}", {"k": str(i)})
+    backup(manager, "b1")
+    path = archive_path(manager, "b1")
+
+    first = restore(manager, "b1")
+    cached = manager._load_parse_cache(path)
+    assert cached is not None
+
+    job = RestoreJob(id="r", backup_id="b1", name="test", namespaces=["all"])
+    metadata, resources, complete = manager._extract_backup_resources(job, path, str(tmp_path / "extract"))
+    assert complete
+    assert cached["metadata"] == metadata
+    assert cached["resources"] == resources
+
+    # The second restore reads the cache and applies the same resources
+    assert restore(manager, "b1") == first
+
+
+def test_stale_parse_cache_is_ignored(manager, cluster):
+    cluster.put("app", "cm0", {"k": "0"})
+    backup(manager, "b1")
+    path = archive_path(manager, "b1")
+    restore(manager, "b1")
+    cache_file = path + ".cache.json"
+    with open(cache_file) as f:
+        cached = json.load(f)
+
+    def write_cache(**keys):
+        tampered = dict(cached, **keys)
+        tampered["resources"]["app/configmaps"][0]["data"] = {"k": "from cache"}
+        with open(cache_file, "w") as f:
+            json.dump(tampered, f)
+
+    # A cache that matches the archive is used as is
+    write_cache()
+    assert restore(manager, "b1") == {("app", "configmaps", "cm0"): {"k": "from cache"}}
+
+    # One written for a different size or mtime is ignored, and the restore
+    # falls back to the archive
+    write_cache(size=cached["size"] + 1)
+    assert manager._load_parse_cache(path) is None
+    assert restore(manager, "b1") == {("app", "configmaps", "cm0"): {"k": "0"}}
+
+    write_cache(mtime_ns=cached["mtime_ns"] - 1)
+    assert manager._load_parse_cache(path) is None
+    assert restore(manager, "b1") == {("app", "configmaps", "cm0"): {"k": "0"}}
+
+    # The archive itself changing invalidates the cache too
+    write_cache()
+    stamp = os.stat(path).st_mtime - 60
+    os.utime(path, (stamp, stamp))
+    assert manager._load_parse_cache(path) is None
+    assert restore(manager, "b1") == {("app", "configmaps", "cm0"): {"k": "0"}}
+
+    # A fallback restore rewrites the cache for the archive as it is now
+    assert manager._load_parse_cache(path)["mtime_ns"] == os.stat(path).st_mtime_ns
+
+
+def test_unreadable_parse_cache_is_ignored(manager, cluster):
+    cluster.put("app", "cm0", {"k": "0"})
+    backup(manager, "b1")
+    path = archive_path(manager, "b1")
+    with open(path + ".cache.json", "w") as f:
+        f.write("{not json")
+    assert manager._load_parse_cache(path) is None
+    assert restore(manager, "b1") == {("app", "configmaps", "cm0"): {"k": "0"}}
+
+
+def test_history_writer_starts_with_the_first_pending_update(manager, cluster, tmp_path):
+    history_file = tmp_path / "history.json"
+    manager.history_file = str(history_file)
+    assert manager._history_thread is None
+
+    # Marking the backup as running starts the writer, while the outcome is
+    # written at once
+    cluster.put("app", "cm0", {"k": "0"})
+    backup(manager, "b1")
+    assert manager._history_thread is not None
+    with open(history_file) as f:
+        assert [job["status"] for job in json.load(f)["backup_jobs"]] == ["completed"]
+
+    # So are deletions
+    assert manager.delete_backup("b1")
+    with open(history_file) as f:
+        assert json.load(f)["backup_jobs"] == []
+
+    manager.close()
+    assert manager._history_thread is None
+
+
+@pytest.mark.parametrize("data_filter", [True, False])
+def test_archive_members_outside_the_extract_dir_are_refused(manager, tmp_path, monkeypatch, data_filter):
+    monkeypatch.setattr(backup_manager, "_TAR_DATA_FILTER", data_filter)
+    archive = tmp_path / "evil.tar.gz"
+    payload = b"kind: ConfigMap\n"
+    with tarfile.open(archive, "w:gz") as tar:
+        member = tarfile.TarInfo("../evil.yaml")
+        member.size = len(payload)
+        tar.addfile(member, io.BytesIO(payload))
+
+    extract_dir = tmp_path / "extract" / "0"
+    extract_dir.mkdir(parents=True)
+    job = RestoreJob(id="r", backup_id="evil", name="test", namespaces=["all"])
+    with pytest.raises(tarfile.TarError):
+        manager._extract_backup_resources(job, str(archive), str(extract_dir))
+    assert not (tmp_path / "extract" / "evil.yaml").exists()
@@ -0,0 +1,280 @@
+"""
+Tests for the cost optimizer's suggestion history file, per-resource
+metrics ring buffer and namespace request totals
+"""
+
+import json
+import os
+import random
+import sys
+
+import numpy as np
+from kubernetes import client
+
+# Add the source directory to the Python path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from agents.cost_optimizer import KubernetesCostOptimizer, _MetricsRing
+
+
+def suggestion(i, savings=1.25):
+    return {
+        "resource_type": "pod",
+        "namespace": "default",
+        "name": f"pod-{i}",
+        "estimated_savings": {"total_monthly": savings},
+    }
+
+
+def optimizer(history_file):
+    return KubernetesCostOptimizer(history_file=str(history_file), use_mock=True)
+
+
+def read_lines(history_file):
+    with open(history_file) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_legacy_array_history_is_rewritten_as_lines(tmp_path):
+    history_file = tmp_path / "history.json"
+    with open(history_file, "w") as f:
+        json.dump([suggestion(i) for i in range(3)], f, indent=2)
+
+    opt = optimizer(history_file)
+    assert [e["name"] for e in opt.optimization_history] == ["pod-0", "pod-1", "pod-2"]
+
+    # The first save after loading an array rewrites the whole file as lines
+    opt._record_suggestion(suggestion(3))
+    opt._save_optimization_history()
+    assert [e["name"] for e in read_lines(history_file)] == ["pod-0", "pod-1", "pod-2", "pod-3"]
+
+    reloaded = optimizer(history_file)
+    assert list(reloaded.optimization_history) == read_lines(history_file)
+
+
+def test_save_appends_only_new_entries(tmp_path):
+    history_file = tmp_path / "history.json"
+    opt = optimizer(history_file)
+    for i in range(3):
+        opt._record_suggestion(suggestion(i))
+    opt._save_optimization_history()
+    with open(history_file, "rb") as f:
+        written = f.read()
+
+    for i in range(3, 5):
+        opt._record_suggestion(suggestion(i))
+    opt._save_optimization_history()
+    with open(history_file, "rb") as f:
+        appended = f.read()
+    assert appended.startswith(written)
+    assert [e["name"] for e in read_lines(history_file)] == [f"pod-{i}" for i in range(5)]
+
+    # Nothing new, nothing written
+    opt._save_optimization_history()
+    with open(history_file, "rb") as f:
+        assert f.read() == appended
+
+
+def test_history_file_is_compacted_at_twice_max_history_size(tmp_path):
+    history_file = tmp_path / "history.json"
+    opt = optimizer(history_file)
+    limit = 2 * opt.max_history_size
+
+    for i in range(limit):
+        opt._record_suggestion(suggestion(i))
+        opt._save_optimization_history()
+    assert len(read_lines(history_file)) == limit
+
+    # One more line would pass the limit, so the file is rewritten from the
+    # in-memory history instead
+    opt._record_suggestion(suggestion(limit))
+    opt._save_optimization_history()
+    assert read_lines(history_file) == list(opt.optimization_history)
+    assert len(read_lines(history_file)) == opt.max_history_size
+
+    # Appends continue from the compacted file
+    opt._record_suggestion(suggestion(limit + 1))
+    opt._save_optimization_history()
+    assert len(read_lines(history_file)) == opt.max_history_size + 1
+
+    # A compacting save (as on shutdown) trims it back to the history
+    opt._save_optimization_history(compact=True)
+    assert read_lines(history_file) == list(opt.optimization_history)
+
+
+def test_savings_total_matches_rescan_after_reload(tmp_path):
+    history_file = tmp_path / "history.json"
+    opt = optimizer(history_file)
+    entries = [suggestion(i, savings=round(i * 0.37 % 50, 2)) for i in range(150)]
+    entries += [{"name": "no-savings"}, dict(suggestion(150), estimated_savings="n/a")]
+    for entry in entries:
+        opt._record_suggestion(entry)
+        opt._save_optimization_history()
+
+    def rescan(history):
+        cents = 0
+        for entry in history:
+            savings = entry.get("estimated_savings")
+            if isinstance(savings, dict):
+                cents += round(savings["total_monthly"] * 100)
+        return cents / 100
+
+    # The running total drops evicted entries
+    assert opt.get_estimated_total_savings()["monthly"] == rescan(opt.optimization_history)
+
+    reloaded = optimizer(history_file)
+    assert list(reloaded.optimization_history) == list(opt.optimization_history)
+    assert reloaded.get_estimated_total_savings() == opt.get_estimated_total_savings()
+    assert reloaded.get_estimated_total_savings()["monthly"] == rescan(reloaded.optimization_history)
+
+
+FIELDS = ("cpu_usage", "memory_usage")
+
+
+class RingModel:
+    """What a _MetricsRing should hold: the newest samples, in a plain list"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.samples = []
+
+    def add(self, timestamp, row):
+        self.samples = (self.samples + [(timestamp, list(row))])[-self.capacity:]
+
+    def trim(self, cutoff):
+        self.samples = [s for s in self.samples if s[0] >= cutoff]
+
+
+def assert_ring_matches(ring, model):
+    assert len(ring) == len(model.samples)
+    assert ring.timestamps().tolist() == [t for t, _ in model.samples]
+    for i, field in enumerate(FIELDS):
+        assert ring.column(field).tolist() == [row[i] for _, row in model.samples]
+        expected_latest = model.samples[-1][1][i] if model.samples else 0.0
+        assert ring.latest(field) == expected_latest
+
+
+def test_ring_wraps_around():
+    ring, model = _MetricsRing(FIELDS, 4), RingModel(4)
+    for t in range(10):
+        ring.append(t, {"cpu_usage": t * 0.5, "memory_usage": t * 100})
+        model.add(t, [t * 0.5, t * 100])
+        assert_ring_matches(ring, model)
+    assert ring.timestamps().tolist() == [6, 7, 8, 9]
+
+
+def test_ring_append_defaults_missing_fields_to_zero():
+    ring = _MetricsRing(FIELDS, 2)
+    ring.append(1, {"cpu_usage": 2.0})
+    assert ring.column("memory_usage").tolist() == [0.0]
+
+
+def test_ring_reads_are_views_until_it_wraps():
+    ring = _MetricsRing(FIELDS, 4)
+    for t in range(3):
+        ring.append(t, {"cpu_usage": t})
+    assert isinstance(ring._order(), slice)
+    assert np.shares_memory(ring.timestamps(), ring._timestamps)
+
+    for t in range(3, 6):
+        ring.append(t, {"cpu_usage": t})
+    assert not isinstance(ring._order(), slice)
+    assert ring.timestamps().tolist() == [2, 3, 4, 5]
+
+
+def test_ring_extend_past_capacity():
+    ring, model = _MetricsRing(FIELDS, 5), RingModel(5)
+    ring.append(0, {"cpu_usage": 1, "memory_usage": 2})
+    model.add(0, [1, 2])
+
+    # More samples than fit: only the newest capacity of them are kept
+    timestamps = np.arange(1, 13)
+    rows = np.column_stack([timestamps * 1.5, timestamps * 10.0])
+    ring.extend(timestamps, rows)
+    for t, row in zip(timestamps.tolist(), rows.tolist()):
+        model.add(t, row)
+    assert_ring_matches(ring, model)
+    assert ring.timestamps().tolist() == [8, 9, 10, 11, 12]
+
+
+def test_ring_trim():
+    ring, model = _MetricsRing(FIELDS, 6), RingModel(6)
+    for t in range(0, 90, 10):
+        ring.append(t, {"cpu_usage": t})
+        model.add(t, [t, 0])
+
+    for cutoff in (0, 35, 40, 41, 80, 1000):
+        ring.trim(cutoff)
+        model.trim(cutoff)
+        assert_ring_matches(ring, model)
+    assert len(ring) == 0
+
+    # Still usable once emptied
+    ring.append(2000, {"cpu_usage": 1})
+    model.add(2000, [1, 0])
+    assert_ring_matches(ring, model)
+
+
+def test_ring_matches_list_model_under_random_operations():
+    rng = random.Random(7)
+    for capacity in (1, 2, 3, 7, 16):
+        ring, model = _MetricsRing(FIELDS, capacity), RingModel(capacity)
+        now = 0
+        for _ in range(300):
+            op = rng.random()
+            if op < 0.5:
+                now += rng.randint(0, 3)
+                row = [rng.random(), float(rng.randint(0, 1 << 30))]
+                ring.append(now, dict(zip(FIELDS, row)))
+                model.add(now, row)
+            elif op < 0.8:
+                count = rng.randint(0, 2 * capacity + 1)
+                timestamps = now + np.cumsum(np.array([rng.randint(0, 3) for _ in range(count)], dtype=np.int64))
+                rows = np.array([[rng.random(), rng.random()] for _ in range(count)]).reshape(count, 2)
+                ring.extend(timestamps, rows)
+                for t, row in zip(timestamps.tolist(), rows.tolist()):
+                    model.add(t, row)
+                if count:
+                    now = int(timestamps[-1])
+            else:
+                cutoff = now - rng.randint(0, 3 * capacity)
+                ring.trim(cutoff)
+                model.trim(cutoff)
+            assert_ring_matches(ring, model)
+
+
+class StubPodCache:
+    """Stands in for the running-pod watch cache"""
+
+    def __init__(self, pods):
+        self.pods = {(pod.metadata.namespace, pod.metadata.name): pod for pod in pods}
+
+    def snapshot(self):
+        return self.pods
+
+
+def pod(namespace, name, cpu, memory, template_hash=None):
+    labels = {"pod-template-hash": template_hash} if template_hash else None
+    owners = [client.V1OwnerReference(api_version="apps/v1", kind="ReplicaSet", name=f"web-{template_hash}",
+                                      uid="rs")] if template_hash else None
+    container = client.V1Container(name="main", resources=client.V1ResourceRequirements(
+        requests={"cpu": cpu, "memory": memory}))
+    return client.V1Pod(metadata=client.V1ObjectMeta(namespace=namespace, name=name, labels=labels,
+                                                     owner_references=owners),
+                        spec=client.V1PodSpec(containers=[container]))
+
+
+def test_namespace_requests_count_every_running_pod(tmp_path):
+    opt = optimizer(tmp_path / "history.json")
+    # Only the pod cache matters here: metrics-server need not know a pod
+    # for its requests to count
+    opt._pod_cache = StubPodCache([
+        pod("app", "web-1", "250m", "256Mi", template_hash="abc"),
+        pod("app", "web-2", "250m", "256Mi", template_hash="abc"),
+        pod("app", "job", "1", "1Gi"),
+        pod("batch", "worker", "1500m", "2Gi"),
+    ])
+    assert opt._namespace_requests() == {
+        "app": [1.5, 1536 * 1024 * 1024],
+        "batch": [1.5, 2 * 1024 * 1024 * 1024],
+    }
@@ -0,0 +1,138 @@
+"""
+Tests for the metrics collector's history file
+"""
+
+import json
+import os
+import sys
+import time
+
+# Add the source directory to the Python path so we can import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from agents.metrics_collector import KubernetesMetricsCollector
+
+
+def sample(i):
+    return {"timestamp": f"2024-01-01T00:00:{i:02d}", "cluster": {"total_cpu_usage": i * 0.5}}
+
+
+def collector(history_file):
+    return KubernetesMetricsCollector(metrics_history_file=str(history_file), use_mock=True)
+
+
+def record(metrics_collector, metrics):
+    """What one pass of the collection loop does with a sample"""
+    metrics_collector.metrics_history.append(metrics)
+    metrics_collector._append_metrics_history(metrics)
+
+
+def read_lines(history_file):
+    with open(history_file) as f:
+        return [json.loads(line) for line in f]
+
+
+def stop(metrics_collector):
+    metrics_collector.running = True
+    metrics_collector.stop_collection_loop()
+
+
+def test_legacy_array_history_round_trip(tmp_path):
+    history_file = tmp_path / "metrics.json"
+    with open(history_file, "w") as f:
+        json.dump([sample(i % 60) for i in range(1500)], f, indent=2)
+
+    mc = collector(history_file)
+    assert len(mc.metrics_history) == mc.max_history_size
+    assert mc.metrics_history[0] == sample(500 % 60)
+
+    # The first append rewrites the array as one sample per line
+    record(mc, sample(1))
+    assert read_lines(history_file) == list(mc.metrics_history)
+    assert len(mc.metrics_history) == mc.max_history_size
+
+    # Already compact, so stopping leaves the file alone
+    inode = os.stat(history_file).st_ino
+    stop(mc)
+    assert os.stat(history_file).st_ino == inode
+
+    reloaded = collector(history_file)
+    assert list(reloaded.metrics_history) == list(mc.metrics_history)
+
+
+def test_line_history_round_trip(tmp_path):
+    history_file = tmp_path / "metrics.json"
+    with open(history_file, "w") as f:
+        f.writelines(json.dumps(sample(i)) + "\n" for i in range(5))
+
+    mc = collector(history_file)
+    assert list(mc.metrics_history) == [sample(i) for i in range(5)]
+    with open(history_file, "rb") as f:
+        written = f.read()
+
+    # Appends add one line per sample and leave the rest of the file as it was
+    for i in range(5, 7):
+        record(mc, sample(i))
+    with open(history_file, "rb") as f:
+        assert f.read().startswith(written)
+    assert read_lines(history_file) == [sample(i) for i in range(7)]
+
+    reloaded = collector(history_file)
+    assert list(reloaded.metrics_history) == [sample(i) for i in range(7)]
+
+
+def test_history_file_is_rewritten_at_twice_max_history_size(tmp_path):
+    history_file = tmp_path / "metrics.json"
+    mc = collector(history_file)
+    limit = 2 * mc.max_history_size
+
+    for i in range(limit):
+        record(mc, sample(i % 60))
+    assert len(read_lines(history_file)) == limit
+
+    # The next sample rewrites the file from the in-memory history
+    record(mc, sample(7))
+    assert read_lines(history_file) == list(mc.metrics_history)
+
+    # Stopping compacts a file that has drifted past the history
+    record(mc, sample(8))
+    assert len(read_lines(history_file)) == mc.max_history_size + 1
+    stop(mc)
+    assert read_lines(history_file) == list(mc.metrics_history)
+
+    reloaded = collector(history_file)
+    assert list(reloaded.metrics_history) == list(mc.metrics_history)
+
+
+def test_collection_loop_appends_each_sample(tmp_path):
+    history_file = tmp_path / "metrics.json"
+    mc = collector(history_file)
+    mc.collection_interval = 0.01
+    mc.start_collection_loop()
+    time.sleep(0.2)
+    mc.stop_collection_loop()
+
+    assert len(mc.metrics_history) > 0
+    assert read_lines(history_file) == list(mc.metrics_history)
+
+
+def test_close_releases_the_query_pool(tmp_path):
+    mc = collector(tmp_path / "metrics.json")
+    # Collect through the query pool with stubbed queries instead of a cluster
+    mc.use_mock = False
+    mc._get_node_metrics = lambda: {"node-1": {"cpu_usage": 1.5}}
+    mc._get_pod_metrics = lambda: {}
+    mc._get_cluster_metrics = lambda: {"total_cpu_usage": 1.5}
+    assert mc._query_pool is None
+
+    assert mc.collect_metrics()["cpu_usage"] == {"node-1": 1.5, "cluster": 1.5}
+    pool = mc._query_pool
+    assert pool is not None
+
+    mc.close()
+    assert mc._query_pool is None
+    assert pool._shutdown
+
+    # The next collection starts a new pool
+    assert mc.collect_metrics()["cpu_usage"] == {"node-1": 1.5, "cluster": 1.5}
+    mc.close()